@@ -1,39 +1,159 @@
-from flask import Flask, render_template, request, send_file, redirect, url_for, flash
+import time
+_import_started = time.perf_counter()  # startup-time measurement, reported below
+
+# .env must be loaded before the project modules below read their settings at import time
+from dotenv import load_dotenv
+load_dotenv()
+
+from flask import Flask, render_template, request, send_file, redirect, url_for, flash, session, Response, stream_with_context, jsonify, g, abort
 from scraper.rozee_scraper import scrape_rozee_jobs_selenium
-from matcher.resume_matcher import extract_text_from_pdf, match_resume_with_jobs, extract_keywords_text
+from scraper.job_store import job_store
+from scraper.job_cache import JobCache
+from matcher.result_store import ResultStore
+from matcher.search_queue import SearchQueue
+from matcher.resume_matcher import match_resume_with_jobs, match_resumes_with_jobs, resume_cache, warm_up
+from resume_parser.resume_parser import MAX_PDF_BYTES
+from sqlite_store import SQLiteStore
 from models import db, User
+from migrations import run_migrations
+from sqlalchemy import and_, or_
+from sqlalchemy.pool import QueuePool
+from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-import pandas as pd
 import os
-import time
+import threading
+from functools import wraps
 from flask import send_from_directory
 from werkzeug.utils import secure_filename
-import google.generativeai as genai
-from dotenv import load_dotenv
-import os
 
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-genai.configure(api_key=GEMINI_API_KEY)
+from llm.llm_client import LLMClient
+from llm.rewrite_store import RewriteStore
+from matcher.resume_cache import text_hash
+from telemetry.metrics import registry, start_trace, finish_trace
+from telemetry.profiler import PROFILE_DIR, list_profiles, profiled
 
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "your-secret-key"
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///users.db"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+    # Pooled connections shared by request threads and the monitor workers
+    "poolclass": QueuePool,
+    "pool_size": 10,
+    "max_overflow": 20,
+    "pool_pre_ping": True,
+    "connect_args": {"timeout": 30, "check_same_thread": False},
+}
 app.config["UPLOAD_FOLDER"] = "data"
+app.config["MAX_CONTENT_LENGTH"] = MAX_PDF_BYTES + 1024 * 1024  # reject oversized uploads up front
 
 # Initialize extensions
 db.init_app(app)
+with app.app_context():
+    run_migrations(db)
 login_manager = LoginManager(app)
 login_manager.login_view = "login"
 
 # Global variables
-job_cache = []
-job_cache_dict = {}  # {job_title: {"timestamp": ..., "df": ...}}
-CACHE_EXPIRY_SECONDS = 1800  # 30 min
+result_store = ResultStore()  # per-user, per-search results shared by all workers
+search_queue = SearchQueue(result_store)  # runs /index and /auto searches off the request thread
+llm_client = LLMClient()  # cached, rate-limited Gemini calls (LLM_BACKEND=fake for a local model)
+rewrite_store = RewriteStore()  # finished resume rewrites, so downloads never call the model again
+scraped_jobs_cache = JobCache()  # shared by all workers through data/job_cache.db
+
+# ------------------ Metrics ------------------
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # if set, /metrics requires "Authorization: Bearer <token>"
+request_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", labels=("endpoint", "method", "status")
+)
+
+def _ratio(hits, misses):
+    return hits / (hits + misses) if hits + misses else 0.0
+
+registry.register_collector("job_cache", scraped_jobs_cache.stats)
+registry.register_collector("job_store", job_store.stats)
+registry.register_collector("resume_cache", lambda: {
+    "hits": resume_cache.hits, "misses": resume_cache.misses,
+    "hit_ratio": _ratio(resume_cache.hits, resume_cache.misses),
+})
+registry.register_collector("llm", lambda: {
+    **llm_client.stats, "hit_ratio": _ratio(llm_client.stats["hits"], llm_client.stats["misses"]),
+})
+registry.register_collector("search_queue", lambda: dict(search_queue.stats))
+
+@app.before_request
+def _start_request_trace():
+    if request.endpoint not in ("static", "metrics"):
+        start_trace(kind="request", method=request.method, path=request.path)
+
+@app.after_request
+def _finish_request_trace(response):
+    if request.endpoint not in ("static", "metrics"):
+        record = finish_trace(status=response.status_code, endpoint=request.endpoint)
+        if record:
+            request_seconds.observe(record["seconds"], endpoint=request.endpoint, method=request.method,
+                                    status=response.status_code)
+    return response
+
+# ------------------ Profiling ------------------
+
+# Comma-separated emails of users allowed to profile requests and monitor rules
+ADMIN_EMAILS = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+QUEUED_ENDPOINTS = {"index", "auto_mode"}  # their work runs on the search queue, which is profiled instead
+
+def is_admin():
+    return current_user.is_authenticated and current_user.email.lower() in ADMIN_EMAILS
+
+def profile_requested():
+    """Admin asked for this unit of work to be profiled (?profile=1, form field or X-Profile: 1)."""
+    flag = request.headers.get("X-Profile") or request.values.get("profile")
+    return flag == "1" and is_admin()
+
+@app.context_processor
+def _inject_admin():
+    return {"is_admin": is_admin()}
+
+@app.before_request
+def _start_request_profile():
+    if request.endpoint not in QUEUED_ENDPOINTS and profile_requested():
+        g.profiler = profiled("request", request.endpoint or request.path)
+        g.profiler.__enter__()
+
+@app.teardown_request
+def _stop_request_profile(error=None):
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.__exit__(None, None, None)
+
+def admin_required(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not is_admin():
+            abort(403)
+        return view(*args, **kwargs)
+    return login_required(wrapper)
+
+@app.route("/admin/profiles")
+@admin_required
+def profile_list():
+    return render_template("profiles.html", profiles=list_profiles())
+
+@app.route("/admin/profiles/<name>")
+@admin_required
+def profile_download(name):
+    if not name.endswith((".prof", ".txt")):
+        abort(404)
+    return send_from_directory(os.path.abspath(PROFILE_DIR), name, as_attachment=name.endswith(".prof"))
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus text exposition of this worker process's metrics."""
+    if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        return "Unauthorized", 401
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
 
 @login_manager.user_loader
 def load_user(user_id):
@@ -81,17 +201,37 @@ def logout():
 
 # ------------------ Helper ------------------
 
-def get_cached_or_scrape_jobs(job_title, pages=2):
-    now = time.time()
-    cached = job_cache_dict.get(job_title.lower())
-
-    if cached and (now - cached["timestamp"] < CACHE_EXPIRY_SECONDS):
-        print(f"✅ Using cached jobs for: {job_title}")
-        return cached["df"]
-
-    df = scrape_rozee_jobs_selenium(job_title, pages=pages)
-    job_cache_dict[job_title.lower()] = {"timestamp": now, "df": df}
-    return df
+def get_cached_or_scrape_jobs(job_title, pages=2, max_age=None):
+    return scraped_jobs_cache.get_or_scrape(job_title, scrape_rozee_jobs_selenium, pages=pages, max_age=max_age)
+
+def run_manual_search(resume_path, job_title, location_filter="", min_score=0.0):
+    """Scrapes and matches for /index; runs on the search queue."""
+    job_df = get_cached_or_scrape_jobs(job_title, pages=2)
+    resume_text = resume_cache.get_text(resume_path)
+    top_matches = match_resume_with_jobs(resume_text, jobs_df=job_df, top_n=100)
+
+    if location_filter:
+        top_matches = top_matches[top_matches["location"].str.contains(location_filter, case=False, na=False)]
+    return top_matches[top_matches["match_score"] >= min_score]
+
+def run_auto_search(resume_path):
+    """Detects the job title from the resume, then scrapes and matches for /auto; runs on the search queue."""
+    resume_text = resume_cache.get_text(resume_path)
+    top_keyword = resume_cache.get_keywords(resume_path, num_keywords=1)
+    query = top_keyword.strip().replace(" ", "+")
+    print("🔍 Auto-detected job title:", query)
+
+    job_df = get_cached_or_scrape_jobs(query, pages=2)
+    return match_resume_with_jobs(resume_text, jobs_df=job_df, top_n=100)
+
+def queue_search(func, *args):
+    """Queues a search for the current user and redirects to its results page."""
+    search_id = search_queue.submit(current_user.id, func, *args, profile=profile_requested())
+    if search_id is None:
+        flash(f"You already have {search_queue.per_user} searches running. Please wait for them to finish.", "warning")
+        return redirect(request.path)
+    session["search_id"] = search_id
+    return redirect(url_for("results_page", search_id=search_id, page=1))
 
 # ------------------ Main Routes ------------------
 @app.route('/')
@@ -102,8 +242,6 @@ def dashboard():
 @app.route("/index", methods=["GET", "POST"])
 @login_required
 def index():
-    global job_cache
-
     if request.method == "POST":
         selected_resume_id = request.form.get("selected_resume")
         resume_file = request.files.get("resume")
@@ -118,7 +256,7 @@ def index():
             db.session.add(new_resume)
             db.session.commit()
 
-            resume_path = filepath
+            resume_path = filepath  # text and keywords are extracted by the queued search
 
         elif selected_resume_id:
             selected = Resume.query.filter_by(id=selected_resume_id, user_id=current_user.id).first()
@@ -137,18 +275,7 @@ def index():
         min_score_input = request.form.get("min_score", "")
         min_score = float(min_score_input) if min_score_input.strip() != "" else 0.0
 
-        job_df = get_cached_or_scrape_jobs(job_title, pages=2)
-        resume_text = extract_text_from_pdf(resume_path)
-        top_matches = match_resume_with_jobs(resume_text, jobs_df=job_df, top_n=100)
-
-        if location_filter:
-            top_matches = top_matches[top_matches["location"].str.contains(location_filter, case=False, na=False)]
-        top_matches = top_matches[top_matches["match_score"] >= min_score]
-
-        top_matches.to_csv("data/matched_jobs.csv", index=False)
-        job_cache = top_matches.to_dict(orient="records")
-
-        return render_template("results.html", matches=job_cache[:10], current_page=1, total_pages=(len(job_cache)+9)//10)
+        return queue_search(run_manual_search, resume_path, job_title, location_filter, min_score)
 
     # GET method — fetch resumes to show in dropdown
     resumes = Resume.query.filter_by(user_id=current_user.id).all()
@@ -162,8 +289,6 @@ from flask import flash
 @app.route("/auto", methods=["GET", "POST"])
 @login_required
 def auto_mode():
-    global job_cache
-
     resumes = Resume.query.filter_by(user_id=current_user.id).all()
 
     if request.method == "POST":
@@ -193,17 +318,8 @@ def auto_mode():
             flash("Please upload or select a resume.", "warning")
             return redirect(url_for("auto_mode"))
 
-        # Resume text + job role detection
-        resume_text = extract_text_from_pdf(resume_path)
-        top_keyword = extract_keywords_text(resume_text, num_keywords=1)
-        query = top_keyword.strip().replace(" ", "+")
-        print("🔍 Auto-detected job title:", query)
-
-        job_df = get_cached_or_scrape_jobs(query, pages=2)
-        top_matches = match_resume_with_jobs(resume_text, jobs_df=job_df, top_n=100)
-
-        job_cache = top_matches.to_dict(orient="records")
-        return redirect(url_for("results_page", page=1))
+        # Job role detection, scraping and matching run on the search queue
+        return queue_search(run_auto_search, resume_path)
 
     return render_template("auto.html", resumes=resumes)
 
@@ -214,32 +330,54 @@ def auto_mode():
 @app.route("/results")
 @login_required
 def results_page():
-    global job_cache
+    search_id = request.args.get("search_id") or session.get("search_id")
     page = int(request.args.get("page", 1))
     per_page = 10
     start = (page - 1) * per_page
-    end = start + per_page
-    total_pages = (len(job_cache) + per_page - 1) // per_page
+    status = result_store.status(search_id, current_user.id) or {"status": "done", "total": 0, "error": None}
+    total_pages = (status["total"] + per_page - 1) // per_page
 
     return render_template(
         "results.html",
-        matches=job_cache[start:end],
+        matches=result_store.page(search_id, current_user.id, start, per_page),
         current_page=page,
-        total_pages=total_pages
+        total_pages=total_pages,
+        search_id=search_id,
+        pending=status["status"] in ("queued", "running"),
+        error=status["error"] if status["status"] == "failed" else None
     )
 
+@app.route("/results/status")
+@login_required
+def results_status():
+    """Polled by the results page while a search is queued or running."""
+    search_id = request.args.get("search_id") or session.get("search_id")
+    status = result_store.status(search_id, current_user.id)
+    if status is None:
+        return jsonify({"status": "unknown"}), 404
+    return jsonify(status)
+
 @app.route("/job/<int:job_id>")
 @login_required
 def job_detail(job_id):
-    if 0 <= job_id < len(job_cache):
-        job = job_cache[job_id]
-        return render_template("job_detail.html", job=job, job_id=job_id)
+    search_id = request.args.get("search_id") or session.get("search_id")
+    job = result_store.get(search_id, current_user.id, job_id)
+    if job:
+        return render_template("job_detail.html", job=job, job_id=job_id, search_id=search_id)
     return "Job not found", 404
 
 @app.route("/download")
 @login_required
 def download_csv():
-    return send_file("data/matched_jobs.csv", as_attachment=True)
+    search_id = request.args.get("search_id") or session.get("search_id")
+    if result_store.total(search_id, current_user.id) is None:
+        flash("No search results to download.", "warning")
+        return redirect(url_for("index"))
+    return Response(
+        stream_with_context(result_store.iter_csv(search_id, current_user.id)),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=matched_jobs.csv"}
+    )
 
 
 # Resume uploads 
@@ -258,10 +396,11 @@ def resume_list():
             new_resume = Resume(
                 user_id=current_user.id,
                 filename=filename,
-                original_filename=file.filename
+                filepath=save_path
             )
             db.session.add(new_resume)
             db.session.commit()
+            search_queue.run_in_background(resume_cache.warm, save_path)  # off the request thread
             flash("Resume uploaded successfully!", "success")
             return redirect(url_for("resume_list"))
 
@@ -279,6 +418,7 @@ def delete_resume(resume_id):
 
     try:
         if os.path.exists(resume.filepath):
+            resume_cache.evict(resume.filepath)
             os.remove(resume.filepath)
         db.session.delete(resume)
         db.session.commit()
@@ -357,18 +497,60 @@ def monitor_rules():
     return render_template("monitor.html", resumes=resumes, rules=rules)
 
 
-from monitoring.background_job import monitor_jobs_loop
-from models import MonitoringRule, WatchlistMatch
+from functools import partial
+from monitoring.background_job import monitor_jobs_loop, CHECK_INTERVAL
+from monitoring.leader import LeaderLease, run_as_leader
+from models import MonitoringRule, WatchlistMatch, WatchlistFeed
+
+# Denormalized per-user watchlist feed, maintained by the monitor
+WATCHLIST_FEED = os.getenv("WATCHLIST_FEED", "1") == "1"
+
+def start_monitor(block=False):
+    """
+    Starts background monitoring behind a leader lease on the app database,
+    so only one process monitors no matter how many import the app.
+    Use run_monitor.py for a dedicated monitor process.
+    """
+    scheduler = {}
+
+    def _on_elected():
+        scheduler["current"] = monitor_jobs_loop(
+            app=app,
+            db=db,
+            MonitoringRule=MonitoringRule,
+            WatchlistMatch=WatchlistMatch,
+            scrape_jobs_func=partial(get_cached_or_scrape_jobs, max_age=CHECK_INTERVAL),
+            extract_text_func=resume_cache.get_text,
+            match_func=match_resume_with_jobs,
+            match_many_func=match_resumes_with_jobs,
+            WatchlistFeed=WatchlistFeed if WATCHLIST_FEED else None
+        )
 
-monitor_jobs_loop(
-    app=app,
-    db=db,
-    MonitoringRule=MonitoringRule,
-    WatchlistMatch=WatchlistMatch,
-    scrape_jobs_func=scrape_rozee_jobs_selenium,
-    extract_text_func=extract_text_from_pdf,
-    match_func=match_resume_with_jobs
-)
+    registry.register_collector(
+        "monitor_scheduler", lambda: dict(scheduler["current"].stats) if scheduler.get("current") else {}
+    )
+
+    def _on_demoted():
+        if scheduler.get("current"):
+            # Wait for in-flight groups so they do not overlap the next leader's runs
+            scheduler.pop("current").stop(wait=True)
+
+    run_as_leader(LeaderLease(app, db, name="monitor"), _on_elected, _on_demoted, block=block)
+
+# Web workers stay lightweight unless EMBEDDED_MONITOR=1. Under gunicorn's preload the
+# import runs in the master, so gunicorn.conf.py starts it in each worker after the fork.
+if os.getenv("EMBEDDED_MONITOR", "0") == "1" and os.getenv("APP_WARMUP") != "preload":
+    start_monitor()
+
+@app.route("/monitor/profile/<int:rule_id>", methods=["POST"])
+@admin_required
+def profile_monitoring_rule(rule_id):
+    """Profiles the next monitor cycle that checks this rule."""
+    rule = MonitoringRule.query.get_or_404(rule_id)
+    rule.profile_next_run = True
+    db.session.commit()
+    flash("The next monitoring run for this rule will be profiled.", "info")
+    return redirect(url_for("monitor_rules"))
 
 @app.route("/monitor/delete/<int:rule_id>", methods=["POST"])
 @login_required
@@ -380,6 +562,7 @@ def delete_monitoring_rule(rule_id):
         return redirect(url_for("monitor_rules"))
 
     # Optional: delete any watchlist matches related to the rule
+    WatchlistFeed.query.filter_by(rule_id=rule.id).delete()
     WatchlistMatch.query.filter_by(rule_id=rule.id).delete()
 
     db.session.delete(rule)
@@ -392,13 +575,60 @@ def delete_monitoring_rule(rule_id):
 @app.route("/watchlist")
 @login_required
 def watchlist():
-    page = request.args.get("page", 1, type=int)
     per_page = 10
-    matches = WatchlistMatch.query.join(MonitoringRule).filter(
-        MonitoringRule.user_id == current_user.id
-    ).order_by(WatchlistMatch.found_at.desc()).paginate(page=page, per_page=per_page)
+    if WATCHLIST_FEED:
+        query, model = WatchlistFeed.query.filter(WatchlistFeed.user_id == current_user.id), WatchlistFeed
+    else:
+        query, model = WatchlistMatch.query.join(MonitoringRule).filter(
+            MonitoringRule.user_id == current_user.id
+        ), WatchlistMatch
+
+    matches, next_cursor, prev_cursor = keyset_page(
+        query, model.found_at, model.id,
+        before=request.args.get("before"), after=request.args.get("after"), per_page=per_page
+    )
+    return render_template("watchlist.html", matches=matches, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+def _cursor(row):
+    return f"{row.found_at.isoformat()}~{row.id}"
 
-    return render_template("watchlist.html", matches=matches)
+def _parse_cursor(cursor):
+    """(found_at, id) from a cursor, or None if it is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        found_at, row_id = cursor.rsplit("~", 1)
+        return datetime.fromisoformat(found_at), int(row_id)
+    except ValueError:
+        return None
+
+def keyset_page(query, found_at_col, id_col, before=None, after=None, per_page=10):
+    """
+    Seek pagination on (found_at, id), newest first, without COUNT or OFFSET.
+    `before` pages forward (older rows), `after` pages back (newer rows).
+    Returns (rows, next_cursor, prev_cursor); a cursor is None when there is no such page.
+    A malformed cursor is ignored, so the first page is shown.
+    """
+    after, before = _parse_cursor(after), _parse_cursor(before)
+    if after:
+        found_at, row_id = after
+        rows = query.filter(or_(found_at_col > found_at, and_(found_at_col == found_at, id_col > row_id))) \
+            .order_by(found_at_col.asc(), id_col.asc()).limit(per_page + 1).all()
+        has_prev = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        if before:
+            found_at, row_id = before
+            query = query.filter(or_(found_at_col < found_at, and_(found_at_col == found_at, id_col < row_id)))
+        rows = query.order_by(found_at_col.desc(), id_col.desc()).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_prev = before is not None
+
+    next_cursor = _cursor(rows[-1]) if rows and has_next else None
+    prev_cursor = _cursor(rows[0]) if rows and has_prev else None
+    return rows, next_cursor, prev_cursor
 @app.route("/watchlist/delete/<int:match_id>", methods=["POST"])
 @login_required
 def delete_watchlist_entry(match_id):
@@ -409,6 +639,7 @@ def delete_watchlist_entry(match_id):
         flash("Unauthorized", "danger")
         return redirect(url_for("watchlist"))
 
+    WatchlistFeed.query.filter_by(id=match.id).delete()
     db.session.delete(match)
     db.session.commit()
     flash("Watchlist entry deleted.", "info")
@@ -418,13 +649,34 @@ def delete_watchlist_entry(match_id):
 
 
 from models import Resume
-from matcher.resume_matcher import extract_text_from_pdf
 from flask import request, render_template, redirect, url_for, flash
 from flask_login import login_required, current_user
-import google.generativeai as genai
 import time, os
 from flask import session
 
+def resume_feedback_prompts(resume_text):
+    """(feedback prompt, rewrite prompt) for a resume."""
+    # Prompt for feedback
+    feedback_prompt = f"""
+        You are a professional resume reviewer.
+        Please give detailed, constructive feedback on the following resume.
+        Focus on formatting, clarity, keywords, structure, and tone.
+
+        Resume:
+        {resume_text}
+        """
+
+    # Prompt for rewriting
+    rewrite_prompt = f"""
+        You are an expert resume editor.
+        Rewrite and improve the following resume to be ATS-friendly, concise, and impactful.
+        Use professional formatting and highlight achievements. Do not add fake experience.
+
+        Resume to improve:
+        {resume_text}
+        """
+    return feedback_prompt, rewrite_prompt
+
 @app.route("/feedback", methods=["GET", "POST"])
 @login_required
 def ai_feedback():
@@ -456,41 +708,17 @@ def ai_feedback():
             flash("Please upload or select a resume.", "warning")
             return redirect(url_for("ai_feedback"))
 
-        resume_text = extract_text_from_pdf(resume_path)
-
-        # Prompt for feedback
-        feedback_prompt = f"""
-        You are a professional resume reviewer.
-        Please give detailed, constructive feedback on the following resume.
-        Focus on formatting, clarity, keywords, structure, and tone.
-
-        Resume:
-        {resume_text}
-        """
-
-        # Prompt for rewriting
-        rewrite_prompt = f"""
-        You are an expert resume editor.
-        Rewrite and improve the following resume to be ATS-friendly, concise, and impactful.
-        Use professional formatting and highlight achievements. Do not add fake experience.
-
-        Resume to improve:
-        {resume_text}
-        """
+        resume_text = resume_cache.get_text(resume_path)
+        feedback_prompt, rewrite_prompt = resume_feedback_prompts(resume_text)
 
         try:
-            model = genai.GenerativeModel("models/gemini-1.5-flash")
-
-            # 1️⃣ Generate feedback
-            feedback_response = model.generate_content(feedback_prompt)
-            feedback = getattr(feedback_response, "text", None)
-
-            # 2️⃣ Generate rewritten resume
-            rewrite_response = model.generate_content(rewrite_prompt)
-            improved_resume = getattr(rewrite_response, "text", None)
+            # Feedback and rewrite are independent, so both prompts run at once
+            feedback, improved_resume = llm_client.generate_many([feedback_prompt, rewrite_prompt])
 
-            # Store improved resume in session for download
-            session["improved_resume"] = improved_resume
+            # Store improved resume server-side for download; the session only keeps its key
+            resume_key = text_hash(resume_text)
+            rewrite_store.put(current_user.id, resume_key, improved_resume or "")
+            session["improved_resume_key"] = resume_key
 
         except Exception as e:
             flash(f"Error generating feedback: {str(e)}", "danger")
@@ -501,20 +729,55 @@ def ai_feedback():
 
     return render_template("feedback.html", resumes=resumes, feedback=feedback, improved_resume=improved_resume)
 
+@app.route("/feedback/stream")
+@login_required
+def ai_feedback_stream():
+    """Streams feedback for a saved resume as it is generated, then the improved resume."""
+    selected = Resume.query.filter_by(id=request.args.get("resume_id", type=int), user_id=current_user.id).first()
+    if not selected:
+        return "Invalid resume selected.", 404
+
+    resume_text = resume_cache.get_text(selected.filepath)
+    feedback_prompt, rewrite_prompt = resume_feedback_prompts(resume_text)
+    rewrite = llm_client.submit(rewrite_prompt)  # runs while the feedback streams
+    user_id = current_user.id
+
+    def _generate():
+        try:
+            for chunk in llm_client.stream(feedback_prompt):
+                yield chunk
+            yield "\n\n===== Improved Resume =====\n\n"
+            improved_resume = rewrite.result() or ""
+            rewrite_store.put(user_id, text_hash(resume_text), improved_resume)  # what the download will serve
+            yield improved_resume
+        except Exception as e:
+            yield f"\n\n⚠️ Error generating feedback: {e}"
+
+    return Response(stream_with_context(_generate()), mimetype="text/plain",
+                    headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"})
+
 from flask import make_response
 
-from docx import Document
 from flask import send_file, session
 import io
 
 @app.route("/download-improved-resume")
 @login_required
 def download_improved_resume():
-    if "improved_resume" not in session:
-        flash("No improved resume found to download.", "warning")
+    resume_id = request.args.get("resume_id", type=int)
+    if resume_id:
+        # Streamed feedback: the rewrite was stored when the stream finished
+        selected = Resume.query.filter_by(id=resume_id, user_id=current_user.id).first_or_404()
+        resume_key = text_hash(resume_cache.get_text(selected.filepath))
+    else:
+        resume_key = session.get("improved_resume_key")
+
+    content = rewrite_store.get(current_user.id, resume_key) if resume_key else None
+    if content is None:
+        flash("No improved resume found to download. Please generate feedback again.", "warning")
         return redirect(url_for("ai_feedback"))
 
-    content = session["improved_resume"]
+    from docx import Document
 
     # Create a Word document in memory
     doc = Document()
@@ -557,7 +820,7 @@ def description_match():
         uploaded_file.save(resume_path)
 
         # Extract text from resume
-        resume_text = extract_text_from_pdf(resume_path)
+        resume_text = resume_cache.get_text(resume_path)
 
         # Create prompt
         prompt = f"""
@@ -575,10 +838,8 @@ Job Description:
 """
 
         try:
-            model = genai.GenerativeModel("gemini-1.5-flash")  # or the latest working free model
-            response = model.generate_content(prompt)
-            if hasattr(response, "text"):
-                feedback = response.text
+            feedback = llm_client.generate(prompt)
+            if feedback:
                 # Try extracting a score if model includes it in response
                 import re
                 match = re.search(r"(\d{1,3})\s*\/?\s*100", feedback)
@@ -638,7 +899,41 @@ Job Description:
 
 
 
+# ------------------ Startup ------------------
+
+# "thread": load models in a background thread so the app serves /login right away
+# "preload": gunicorn.conf.py loads them in the master before forking workers
+# "off": load on first use
+APP_WARMUP = os.getenv("APP_WARMUP", "thread")
+startup_timings = {"import_seconds": time.perf_counter() - _import_started, "warmup_seconds": None}
+print(f"🚀 App imported in {startup_timings['import_seconds'] * 1000:.0f} ms")
+registry.register_collector("startup", lambda: startup_timings)
+
+def warm_up_models(encode=True):
+    """Loads the matching models ahead of the first request and records how long it took."""
+    try:
+        startup_timings["warmup_seconds"] = warm_up(encode)
+        print(f"🔥 Models warmed up in {startup_timings['warmup_seconds']:.1f}s")
+    except Exception as e:
+        print(f"⚠️ Model warm-up failed: {e}")
+
+if APP_WARMUP == "thread":
+    threading.Thread(target=warm_up_models, name="warm-up", daemon=True).start()
+
+def reset_after_fork():
+    """
+    Called in each gunicorn worker after it is forked from a preloading master:
+    SQLite connections must not be shared with the parent, so the pooled
+    SQLAlchemy connections and the stores' thread-local connections are
+    dropped (not closed) and reopened on first use.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    SQLiteStore.reset_all_after_fork()
+
 # ------------------ Run App ------------------
 
 if __name__ == "__main__":
+    if os.getenv("EMBEDDED_MONITOR", "0") != "1":
+        start_monitor()  # single-process dev server: monitor in the background as before
     app.run(debug=True)
@@ -0,0 +1,328 @@
+# benchmarks/bench_matcher.py
+#
+# Benchmarks the matching pipeline on synthetic data.
+#
+#   python benchmarks/bench_matcher.py --sizes 1000 10000 100000 --output bench.json
+#   python benchmarks/bench_matcher.py --baseline bench.json        # fail on >25% slowdowns
+#   python benchmarks/bench_matcher.py --sizes 1000 --compare-modes  # needs KeyBERT
+#
+# Every stage reports wall time, peak traced memory and throughput. The run
+# writes JSON; limits in benchmarks/thresholds.json and the --baseline
+# comparison make the script exit with status 1 when a stage regresses.
+
+import argparse
+import atexit
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+# Stores used by the matcher live in a throwaway directory, never in data/
+WORK_DIR = tempfile.mkdtemp(prefix="bench_matcher_")
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+os.environ.setdefault("KEYWORD_STORE_PATH", os.path.join(WORK_DIR, "job_keywords.db"))
+os.environ.setdefault("EMBEDDING_DIR", os.path.join(WORK_DIR, "job_embeddings"))
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(WORK_DIR, "jobs.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matcher.embedding_file import EmbeddingFile  # noqa: E402
+from matcher.keyword_store import content_hash  # noqa: E402
+from matcher.text_prefilter import InvertedIndex  # noqa: E402
+from matcher.tfidf_corpus import TfidfCorpus  # noqa: E402
+from resume_parser.resume_parser import extract_text_from_pdf  # noqa: E402
+
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_PAGES = [1, 4, 16, 40]
+DEFAULT_SHORTLISTS = [100, 500, 1000]
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2, KeyBERT's default encoder
+
+ROLES = ["Python Developer", "Data Scientist", "Frontend Engineer", "Accountant", "Sales Manager",
+         "DevOps Engineer", "Graphic Designer", "HR Officer", "Android Developer", "QA Engineer",
+         "Civil Engineer", "Content Writer", "Network Administrator", "Business Analyst", "Teacher"]
+SKILLS = ["python", "django", "flask", "react", "javascript", "sql", "excel", "tally", "sap", "aws", "docker",
+          "kubernetes", "figma", "photoshop", "recruitment", "payroll", "kotlin", "java", "selenium", "autocad",
+          "seo", "copywriting", "cisco", "linux", "power bi", "tableau", "machine learning", "pandas", "negotiation",
+          "crm", "communication", "leadership", "budgeting", "testing", "agile", "scrum", "git", "rest api"]
+FILLER = ["experience", "team", "work", "years", "required", "candidate", "company", "strong", "skills",
+          "knowledge", "ability", "project", "develop", "manage", "support", "client", "office", "salary",
+          "opportunity", "responsible", "degree", "good", "environment", "growth", "customers", "reports"]
+CITIES = ["Karachi", "Lahore", "Islamabad", "Rawalpindi", "Faisalabad", "Multan", "Peshawar", "Remote"]
+
+
+# -------- Synthetic data --------
+
+def synthetic_text(rng, words, skill_share=0.3):
+    return " ".join(rng.choice(SKILLS) if rng.random() < skill_share else rng.choice(FILLER) for _ in range(words))
+
+def synthetic_jobs(n, seed=0):
+    """n postings as (title, company, location, description, link) dicts with 40-160 word descriptions."""
+    rng = random.Random(seed)
+    return [
+        {
+            "title": f"{rng.choice(ROLES)} {rng.choice(['', 'Senior', 'Junior', 'Lead'])}".strip(),
+            "company": f"Company {rng.randrange(n // 10 + 1)}",
+            "location": rng.choice(CITIES),
+            "description": synthetic_text(rng, rng.randint(40, 160)),
+            "link": f"https://www.rozee.pk/company-jobs-{i}",
+        }
+        for i in range(n)
+    ]
+
+def synthetic_resume(rng, pages):
+    """Resume text of roughly `pages` pages (about 45 lines of 10 words each)."""
+    return [
+        "\n".join(synthetic_text(rng, 10, skill_share=0.4) for _ in range(45))
+        for _ in range(pages)
+    ]
+
+def write_resume_pdf(path, page_texts):
+    import fitz  # PyMuPDF
+
+    with fitz.open() as doc:
+        for text in page_texts:
+            page = doc.new_page()
+            page.insert_text((50, 60), text, fontsize=9)
+        doc.save(path)
+
+
+# -------- Measurement --------
+
+def measure(results, stage, label, func, items=None, unit="items", trace_memory=True):
+    """Runs func once and appends wall time, peak traced memory and throughput to results."""
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if trace_memory:
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    record = {"stage": stage, "label": label, "seconds": seconds, "peak_mb": peak_mb}
+    if items:
+        record["throughput"] = items / seconds if seconds else None
+        record["unit"] = f"{unit}/s"
+    results.append(record)
+    rate = f" | {record['throughput']:,.0f} {record['unit']}" if items and seconds else ""
+    memory = f" | peak {peak_mb:,.1f} MB" if peak_mb is not None else ""
+    print(f"⏱️ {stage}@{label}: {seconds * 1000:,.1f} ms{rate}{memory}")
+    return value
+
+def model_available():
+    try:
+        import keybert  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# -------- Stages --------
+
+def bench_pdf_extract(results, pages_list, trace_memory):
+    rng = random.Random(1)
+    for pages in pages_list:
+        path = os.path.join(WORK_DIR, f"resume_{pages}p.pdf")
+        write_resume_pdf(path, synthetic_resume(rng, pages))
+        measure(results, "pdf_extract", f"pages={pages}",
+                lambda: extract_text_from_pdf(path, max_pages=None, max_bytes=None),
+                items=pages, unit="pages", trace_memory=trace_memory)
+
+def bench_corpus(results, n, resumes, top_n, trace_memory, shortlists=DEFAULT_SHORTLISTS):
+    from matcher.resume_matcher import top_k_indices
+
+    label = f"jobs={n}"
+    jobs = synthetic_jobs(n, seed=n)
+    texts = [f"{job['title']} {job['description']}" for job in jobs]
+    keys = [content_hash(text) for text in texts]
+    rng = random.Random(2)
+    resume_texts = ["\n".join(synthetic_resume(rng, 2)) for _ in range(resumes)]
+
+    # -------- TF-IDF fit / transform --------
+    TfidfCorpus().add_many(["warm-up"], ["warm up"])  # sklearn is imported lazily; keep that out of the timing
+    corpus = TfidfCorpus(max_docs=n)
+    measure(results, "tfidf_fit", label, lambda: corpus.add_many(keys, texts),
+            items=n, unit="jobs", trace_memory=trace_memory)
+    corpus.similarity_matrix(resume_texts[:1], keys[:1])  # builds the cached job matrix outside the timing
+    tfidf_scores = measure(results, "tfidf_transform", label, lambda: corpus.similarity_matrix(resume_texts, keys),
+                           items=n * resumes, unit="pairs", trace_memory=trace_memory)
+
+    # -------- Dense scoring on the memory-mapped embedding file --------
+    vectors = np.random.default_rng(3).normal(size=(n, EMBEDDING_DIM)).astype(np.float32)
+    embeddings = EmbeddingFile(tempfile.mkdtemp(dir=WORK_DIR))
+    measure(results, "embedding_write", label, lambda: embeddings.append(keys, vectors),
+            items=n, unit="jobs", trace_memory=trace_memory)
+    del vectors
+    queries = np.random.default_rng(4).normal(size=(resumes, EMBEDDING_DIM)).astype(np.float32)
+    measure(results, "dense_score", label, lambda: embeddings.score(queries, keys),
+            items=n * resumes, unit="pairs", trace_memory=trace_memory)
+
+    # -------- Ranking --------
+    measure(results, "ranking", label, lambda: [top_k_indices(row, top_n) for row in tfidf_scores],
+            items=n * resumes, unit="scores", trace_memory=trace_memory)
+
+    # -------- Full-text prefilter, recall against the exhaustive TF-IDF top-n --------
+    index = InvertedIndex(max_docs=n)
+    measure(results, "prefilter_index", label, lambda: index.add_many(keys, texts),
+            items=n, unit="jobs", trace_memory=trace_memory)
+    reference = [{keys[i] for i in top_k_indices(row, top_n)} for row in tfidf_scores]
+    for size in shortlists:
+        if size >= n:
+            continue
+        kept = measure(results, "prefilter", f"{label},shortlist={size}",
+                       lambda: [index.shortlist([text], keys, size) for text in resume_texts],
+                       items=n * resumes, unit="pairs", trace_memory=trace_memory)
+        recall = float(np.mean([len(top & shortlist) / len(top) for top, shortlist in zip(reference, kept)]))
+        results.append({"stage": "prefilter_recall", "label": f"{label},shortlist={size}",
+                        "recall": recall, "top_n": top_n})
+        print(f"🔎 prefilter_recall@{label},shortlist={size}: {recall:.0%} of the TF-IDF top-{top_n}")
+    return jobs
+
+def bench_model(results, jobs, resumes, trace_memory, compare_modes, shortlists=DEFAULT_SHORTLISTS):
+    import pandas as pd
+    from matcher import resume_matcher
+
+    label = f"jobs={len(jobs)}"
+    measure(results, "model_load", "keybert", resume_matcher.get_kw_model, trace_memory=False)
+
+    rng = random.Random(5)
+    resume_texts = ["\n".join(synthetic_resume(rng, 2)) for _ in range(resumes)]
+    measure(results, "keybert_resume", "pages=2", lambda: resume_matcher.extract_keywords_text(resume_texts[0]),
+            items=1, unit="resumes", trace_memory=trace_memory)
+
+    job_texts = [f"{job['title']} {job['description']}" for job in jobs]
+    measure(results, "keybert_jobs_batch", label, lambda: resume_matcher.extract_keywords_batch(job_texts),
+            items=len(job_texts), unit="jobs", trace_memory=trace_memory)
+
+    jobs_df = pd.DataFrame(jobs)
+    for mode in ("hybrid", "dense"):
+        resume_matcher.match_resumes_with_jobs(resume_texts, jobs_df=jobs_df, mode=mode)  # fill stores
+        measure(results, f"match_{mode}", label,
+                lambda: resume_matcher.match_resumes_with_jobs(resume_texts, jobs_df=jobs_df, mode=mode),
+                items=len(jobs) * resumes, unit="pairs", trace_memory=trace_memory)
+
+    if compare_modes:
+        report = resume_matcher.compare_matching_modes(resume_texts, jobs_df=jobs_df)
+        results.append({"stage": "compare_modes", "label": label, **report})
+
+    sizes = [size for size in shortlists if size < len(jobs)]
+    if sizes:
+        report = resume_matcher.evaluate_prefilter(resume_texts, jobs_df=jobs_df, shortlist_sizes=sizes, mode="hybrid")
+        results.append({"stage": "prefilter_recall_hybrid", "label": label, **report})
+
+
+# -------- Regression checks --------
+
+def load_thresholds(path):
+    if not path or not os.path.exists(path):
+        return {"max_regression": 0.25, "limits": {}}
+    with open(path) as f:
+        return json.load(f)
+
+def check_regressions(results, thresholds, baseline=None):
+    """Returns a message per stage over its absolute limit or slower than the baseline by max_regression."""
+    failures = []
+    limits = thresholds.get("limits", {})
+    max_regression = thresholds.get("max_regression", 0.25)
+    previous = {}
+    if baseline:
+        previous = {f"{r['stage']}@{r['label']}": r for r in baseline["results"] if "seconds" in r}
+
+    for record in results:
+        if "seconds" not in record:
+            continue
+        key = f"{record['stage']}@{record['label']}"
+        for metric, limit in limits.get(key, {}).items():
+            value = record.get(metric)
+            if value is not None and value > limit:
+                failures.append(f"{key}: {metric} {value:.3f} over limit {limit}")
+        before = previous.get(key)
+        if before and before["seconds"] and record["seconds"] > before["seconds"] * (1 + max_regression):
+            failures.append(
+                f"{key}: {record['seconds']:.3f}s vs baseline {before['seconds']:.3f}s "
+                f"(+{record['seconds'] / before['seconds'] - 1:.0%}, allowed +{max_regression:.0%})"
+            )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume/job matching pipeline on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="job corpus sizes (1k-500k)")
+    parser.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGES, help="resume PDF lengths in pages")
+    parser.add_argument("--resumes", type=int, default=4, help="resumes scored per corpus")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--model-max-jobs", type=int, default=2000,
+                        help="KeyBERT stages run only on corpora up to this size")
+    parser.add_argument("--skip-model", action="store_true", help="skip the KeyBERT/encoder stages")
+    parser.add_argument("--shortlists", type=int, nargs="+", default=DEFAULT_SHORTLISTS,
+                        help="full-text prefilter shortlist sizes to report recall for")
+    parser.add_argument("--compare-modes", action="store_true", help="also report hybrid vs dense agreement")
+    parser.add_argument("--no-memory", action="store_true", help="do not trace memory (lower timing overhead)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH)
+    parser.add_argument("--baseline", help="previous --output file to compare against")
+    args = parser.parse_args(argv)
+
+    trace_memory = not args.no_memory
+    results = []
+    started = time.time()
+
+    bench_pdf_extract(results, args.pages, trace_memory)
+
+    model_jobs = None
+    for n in sorted(args.sizes):
+        jobs = bench_corpus(results, n, args.resumes, args.top_n, trace_memory, args.shortlists)
+        if n <= args.model_max_jobs:
+            model_jobs = jobs
+
+    if args.skip_model:
+        pass
+    elif not model_available():
+        print("⚠️ KeyBERT is not installed; skipping model stages")
+    elif model_jobs is None:
+        print(f"⚠️ No corpus of at most {args.model_max_jobs} jobs; skipping model stages")
+    else:
+        bench_model(results, model_jobs, args.resumes, trace_memory, args.compare_modes, args.shortlists)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = check_regressions(results, load_thresholds(args.thresholds), baseline)
+
+    report = {
+        "started_at": started,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+        "memory_traced": trace_memory,
+        "results": results,
+        "regressions": failures,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📄 Results written to {args.output}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
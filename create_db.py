@@ -1,6 +1,7 @@
 from models import db
+from migrations import run_migrations
 from app import app
 
 with app.app_context():
-    db.create_all()
+    run_migrations(db)
     print("✅ Database created.")
@@ -0,0 +1,38 @@
+# gunicorn.conf.py
+# Run with: gunicorn app:app
+#
+# The app is imported once in the master and the models are loaded there,
+# so every forked worker shares the same weights copy-on-write instead of
+# loading its own copy.
+
+import gc
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()  # so GUNICORN_* and APP_WARMUP can be set in .env like the app's other settings
+os.environ.setdefault("APP_WARMUP", "preload")  # app.py must not start its own warm-up thread
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+timeout = 120
+preload_app = True
+
+
+def on_starting(server):
+    # Runs in the master after the preloaded app import, before any worker is forked
+    if os.environ["APP_WARMUP"] != "preload":
+        return
+    from app import warm_up_models
+    warm_up_models(encode=False)
+    # Keep the loaded objects out of the collector so workers do not touch (and copy) their pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Runs in each worker: nothing opened by the master may be used across the fork
+    from app import reset_after_fork, start_monitor
+    reset_after_fork()
+    if os.getenv("EMBEDDED_MONITOR", "0") == "1" and os.environ["APP_WARMUP"] == "preload":
+        start_monitor()  # app.py skipped it in the master; the leader lease keeps it to one worker
@@ -2,6 +2,7 @@
 
 from app import app
 from models import db
+from migrations import run_migrations
 with app.app_context():
-    db.create_all()
+    run_migrations(db)
     print("✅ Database tables created.")
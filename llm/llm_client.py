@@ -0,0 +1,258 @@
+# llm/llm_client.py
+
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from telemetry.metrics import timed
+
+DEFAULT_MODEL = os.getenv("LLM_MODEL", "gemini-1.5-flash")
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")  # "gemini" or "fake"
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "256"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))  # seconds
+# Requests per second (15 per minute). The bucket is per process: with N gunicorn
+# workers (plus a monitor process) the app can send up to N x LLM_RATE, so divide
+# the provider's quota by the number of processes.
+LLM_RATE = float(os.getenv("LLM_RATE", "0.25"))
+LLM_BURST = int(os.getenv("LLM_BURST", "4"))
+LLM_MAX_RETRIES = 4
+LLM_WORKERS = 4
+
+# Errors worth retrying, by class name, so google.api_core does not have to be imported here
+RETRYABLE_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+    "DeadlineExceeded", "InternalServerError", "TransientLLMError",
+}
+
+
+class TransientLLMError(Exception):
+    """A failure that may succeed on retry (rate limited, overloaded, timed out)."""
+
+
+def is_retryable(error):
+    return type(error).__name__ in RETRYABLE_ERRORS or isinstance(error, (ConnectionError, TimeoutError))
+
+
+def prompt_key(model, prompt):
+    return model, hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+# -------- Backends --------
+
+class GeminiBackend:
+    """google.generativeai, imported and configured on first use; one GenerativeModel per model name."""
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self._genai = None
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _model(self, model):
+        with self._lock:
+            if self._genai is None:
+                import google.generativeai as genai
+                genai.configure(api_key=self.api_key)
+                self._genai = genai
+            if model not in self._models:
+                self._models[model] = self._genai.GenerativeModel(model)
+            return self._models[model]
+
+    def generate(self, model, prompt):
+        response = self._model(model).generate_content(prompt)
+        return getattr(response, "text", None)
+
+    def stream(self, model, prompt):
+        for chunk in self._model(model).generate_content(prompt, stream=True):
+            text = getattr(chunk, "text", None)
+            if text:
+                yield text
+
+
+class FakeBackend:
+    """
+    Local stand-in for tests and offline development.
+    Answers with `responses[prompt]` if given, otherwise a canned reply that
+    echoes the start of the prompt. `latency` simulates model time and the
+    first `fail_times` calls raise TransientLLMError to exercise retries.
+    """
+
+    def __init__(self, responses=None, latency=0.0, fail_times=0):
+        self.responses = responses or {}
+        self.latency = latency
+        self.fail_times = fail_times
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, model, prompt):
+        with self._lock:
+            self.calls += 1
+            fail = self.fail_times > 0
+            if fail:
+                self.fail_times -= 1
+        time.sleep(self.latency)
+        if fail:
+            raise TransientLLMError("fake backend is overloaded")
+        if prompt in self.responses:
+            return self.responses[prompt]
+        return f"[{model}] Score: 75/100. Response to: {' '.join(prompt.split())[:80]}"
+
+    def stream(self, model, prompt):
+        text = self.generate(model, prompt)
+        for start in range(0, len(text), 16):
+            yield text[start:start + 16]
+
+
+# -------- Rate limiting and caching --------
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate=LLM_RATE, capacity=LLM_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """LRU of responses keyed by (model, prompt hash); entries older than `ttl` are dropped."""
+
+    def __init__(self, max_entries=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored_at, text)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, text):
+        with self._lock:
+            self._entries[key] = (time.time(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# -------- Client --------
+
+class LLMClient:
+    """
+    Cached, rate-limited access to a text model.
+
+    - generate(): one prompt; served from the cache when the same (model, prompt)
+      was answered within the TTL.
+    - generate_many(): independent prompts issued concurrently.
+    - stream(): yields the response in chunks as the model produces them.
+    Every model call takes a token from the bucket first, and transient
+    errors are retried with exponential backoff and jitter.
+    """
+
+    def __init__(self, backend=None, cache=None, bucket=None, max_retries=LLM_MAX_RETRIES, workers=LLM_WORKERS,
+                 default_model=DEFAULT_MODEL):
+        self.backend = backend or (FakeBackend() if LLM_BACKEND == "fake" else GeminiBackend())
+        self.cache = cache or ResponseCache()
+        self.bucket = bucket or TokenBucket()
+        self.max_retries = max_retries
+        self.default_model = default_model
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "retries": 0, "errors": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _with_retries(self, call):
+        for attempt in range(self.max_retries + 1):
+            with timed("llm_rate_limit_wait"):
+                self.bucket.acquire()
+            try:
+                with timed("llm_call"):
+                    return call()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    self._count("errors")
+                    raise
+                self._count("retries")
+                delay = min(30, 2 ** attempt) * random.uniform(0.5, 1.5)
+                print(f"⚠️ LLM call failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def generate(self, prompt, model=None):
+        model = model or self.default_model
+        key = prompt_key(model, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+
+        self._count("misses")
+        text = self._with_retries(lambda: self.backend.generate(model, prompt))
+        if text:
+            self.cache.put(key, text)
+        return text
+
+    def generate_many(self, prompts, model=None):
+        """Responses for several independent prompts, in order, issued concurrently."""
+        futures = [self._executor.submit(self.generate, prompt, model) for prompt in prompts]
+        return [future.result() for future in futures]
+
+    def submit(self, prompt, model=None):
+        """Starts generate() in the background and returns its Future."""
+        return self._executor.submit(self.generate, prompt, model)
+
+    def stream(self, prompt, model=None):
+        """
+        Yields the response in chunks. A cached response comes back as one chunk;
+        a streamed one is cached once it is complete. Retries only happen before
+        the first chunk has been sent.
+        """
+        model = model or self.default_model
+        key = prompt_key(model, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count("hits")
+            yield cached
+            return
+
+        self._count("misses")
+
+        def _start():
+            chunks = self.backend.stream(model, prompt)
+            return chunks, next(chunks, "")
+
+        chunks, first = self._with_retries(_start)
+        parts = [first]
+        yield first
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        self.cache.put(key, "".join(parts))
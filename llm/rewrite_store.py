@@ -0,0 +1,52 @@
+# llm/rewrite_store.py
+
+import os
+import time
+
+from sqlite_store import SQLiteStore
+
+REWRITE_STORE_PATH = os.getenv("REWRITE_STORE_PATH", "data/resume_rewrites.db")
+REWRITE_TTL = int(os.getenv("REWRITE_TTL", str(7 * 86400)))  # rewrites can be downloaded for a week
+
+
+class RewriteStore(SQLiteStore):
+    """
+    Finished AI resume rewrites, keyed by (user, resume text hash) and shared
+    by all workers through one SQLite file.
+
+    The download serves exactly the text the user was shown, from any worker,
+    without a second model call. Rewrites older than `ttl` are purged.
+    """
+
+    def __init__(self, path=REWRITE_STORE_PATH, ttl=REWRITE_TTL):
+        self.ttl = ttl
+        super().__init__(path)
+
+    def _create_schema(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS rewrite (
+                user_id INTEGER NOT NULL,
+                resume_hash TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (user_id, resume_hash)
+            )
+        """)
+
+    def put(self, user_id, resume_hash, content):
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO rewrite (user_id, resume_hash, content, created_at) VALUES (?, ?, ?, ?)",
+                (user_id, resume_hash, content, now),
+            )
+            conn.execute("DELETE FROM rewrite WHERE created_at < ?", (now - self.ttl,))
+
+    def get(self, user_id, resume_hash):
+        """The stored rewrite, or None if there is none or it expired."""
+        row = self._conn().execute(
+            "SELECT content FROM rewrite WHERE user_id = ? AND resume_hash = ? AND created_at >= ?",
+            (user_id, resume_hash, time.time() - self.ttl),
+        ).fetchone()
+        return row[0] if row else None
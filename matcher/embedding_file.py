@@ -0,0 +1,200 @@
+# matcher/embedding_file.py
+
+import json
+import os
+import shutil
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+EMBEDDING_DIR = os.getenv("EMBEDDING_DIR", "data/job_embeddings")
+EMBEDDING_DTYPE = os.getenv("EMBEDDING_DTYPE", "int8")  # "int8" or "float16"
+SCORE_CHUNK_ROWS = 65536
+MAX_SEGMENTS = 32  # segments are merged into one beyond this
+
+# The mapped segments and key -> row map, replaced as a whole on refresh so readers
+# never see a row map that points at segments they do not have
+_Snapshot = namedtuple("_Snapshot", ["segments", "rows"])  # {name: (vectors, scales)}, {key: (name, row)}
+
+
+def quantize(vectors, dtype):
+    """
+    L2-normalizes vectors and stores them compactly.
+    - float16: the normalized vectors, scales all 1.
+    - int8: each vector divided by its own scale (max |value| / 127) and rounded.
+    Returns (data, scales) with v ~= data * scale.
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    vectors = vectors / norms
+
+    if dtype == "float16":
+        return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127
+        scales[scales == 0] = 1
+        data = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return data, scales.astype(np.float32)
+    raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+
+class EmbeddingFile:
+    """
+    Job embeddings in compact, read-only, memory-mapped files.
+
+    The directory holds immutable segments, each with:
+        vectors.npy  (n, dim) int8 or float16
+        scales.npy   (n,) float32 per-vector scale
+        keys.npy     (n,) posting content hashes
+        meta.json    dtype, dim, count
+    Segments are written to a temporary directory and renamed into place, so
+    readers never see partial files. They are opened with mmap_mode="r", so
+    every worker process shares the same pages through the OS page cache
+    instead of holding its own copy of the vectors. Only the key -> row map
+    lives in each process's heap.
+    """
+
+    def __init__(self, directory=EMBEDDING_DIR, dtype=EMBEDDING_DTYPE):
+        self.directory = directory
+        self.dtype = dtype
+        self._snapshot = _Snapshot({}, {})
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.refresh()
+
+    def __len__(self):
+        return len(self._snapshot.rows)
+
+    def __contains__(self, key):
+        return key in self._snapshot.rows
+
+    def refresh(self):
+        """Maps segments written since the last refresh (by any process) and drops removed ones."""
+        with self._lock:
+            names = sorted(n for n in os.listdir(self.directory) if n.startswith("segment-"))
+            current = self._snapshot.segments
+            if set(names) == set(current):
+                return
+            segments, rows = {}, {}
+            for name in names:
+                path = os.path.join(self.directory, name)
+                try:
+                    if name in current:
+                        segments[name] = current[name]
+                        keys = np.load(os.path.join(path, "keys.npy"), mmap_mode="r")
+                    else:
+                        vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+                        scales = np.load(os.path.join(path, "scales.npy"), mmap_mode="r")
+                        keys = np.load(os.path.join(path, "keys.npy"), mmap_mode="r")
+                        segments[name] = (vectors, scales)
+                except FileNotFoundError:
+                    continue  # removed by a concurrent compaction
+                for row, key in enumerate(keys):
+                    rows[key.decode("ascii")] = (name, row)
+            self._snapshot = _Snapshot(segments, rows)  # one assignment: readers see the old or the new state
+
+    def append(self, keys, vectors):
+        """Writes keys not stored yet as a new segment."""
+        self.refresh()
+        rows = self._snapshot.rows
+        new = [(k, v) for k, v in zip(keys, vectors) if k not in rows]
+        if not new:
+            return
+        data, scales = quantize([v for _, v in new], self.dtype)
+        self._write_segment([k for k, _ in new], data, scales)
+        self.refresh()
+        if len(self._snapshot.segments) > MAX_SEGMENTS:
+            self.compact()
+
+    def _write_segment(self, keys, data, scales):
+        name = f"segment-{time.time_ns()}-{os.getpid()}"
+        tmp = os.path.join(self.directory, f".tmp-{name}")
+        os.makedirs(tmp)
+        np.save(os.path.join(tmp, "vectors.npy"), data)
+        np.save(os.path.join(tmp, "scales.npy"), scales)
+        np.save(os.path.join(tmp, "keys.npy"), np.array(keys, dtype="S64"))
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({"dtype": str(data.dtype), "dim": int(data.shape[1]), "count": len(keys)}, f)
+        os.rename(tmp, os.path.join(self.directory, name))
+
+    def compact(self):
+        """Merges all segments into one. Readers keep their old mappings until they refresh."""
+        with self._lock:
+            snapshot = self._snapshot
+            names = list(snapshot.segments)
+            if len(names) < 2:
+                return
+            by_segment = {}
+            for key, (name, row) in snapshot.rows.items():
+                by_segment.setdefault(name, []).append((row, key))
+            keys, data, scales = [], [], []
+            for name, entries in by_segment.items():
+                entries.sort()
+                rows = np.array([row for row, _ in entries])
+                vectors, segment_scales = snapshot.segments[name]
+                keys.extend(key for _, key in entries)
+                data.append(np.asarray(vectors[rows]))
+                scales.append(np.asarray(segment_scales[rows]))
+        self._write_segment(keys, np.concatenate(data), np.concatenate(scales))
+        for name in names:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        self.refresh()
+
+    def _locate(self, keys):
+        """The snapshot to read from and {segment: (rows, positions in keys)} for the known keys."""
+        if any(k not in self._snapshot.rows for k in keys):
+            self.refresh()
+        snapshot = self._snapshot  # rows and segments from the same refresh, whatever other threads do
+
+        by_segment = {}
+        for position, key in enumerate(keys):
+            location = snapshot.rows.get(key)
+            if location is not None:
+                by_segment.setdefault(location[0], ([], []))
+                by_segment[location[0]][0].append(location[1])
+                by_segment[location[0]][1].append(position)
+        return snapshot, by_segment
+
+    def vectors(self, keys):
+        """
+        Dequantized float32 vectors (len(keys) x dim) for a batch of keys;
+        unknown keys get a zero row. Meant for bounded batches (index training
+        and bucketing), not for loading the whole corpus.
+        """
+        snapshot, by_segment = self._locate(keys)
+        dim = next(iter(snapshot.segments.values()))[0].shape[1] if snapshot.segments else 0
+        out = np.zeros((len(keys), dim), dtype=np.float32)
+        for name, (rows, positions) in by_segment.items():
+            vectors, scales = snapshot.segments[name]
+            rows = np.asarray(rows)
+            order = np.argsort(rows)  # sequential page access
+            rows, positions = rows[order], np.asarray(positions)[order]
+            out[positions] = vectors[rows].astype(np.float32) * scales[rows][:, None]
+        return out
+
+    def score(self, queries, keys, chunk_rows=SCORE_CHUNK_ROWS):
+        """
+        Cosine scores (len(queries) x len(keys)) computed directly on the mapped
+        arrays, `chunk_rows` stored vectors at a time. Unknown keys score 0.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        queries = queries / norms
+
+        snapshot, by_segment = self._locate(keys)
+        scores = np.zeros((len(queries), len(keys)), dtype=np.float32)
+        for name, (rows, columns) in by_segment.items():
+            vectors, scales = snapshot.segments[name]
+            rows = np.asarray(rows)
+            columns = np.asarray(columns)
+            order = np.argsort(rows)  # sequential page access
+            rows, columns = rows[order], columns[order]
+            for start in range(0, len(rows), chunk_rows):
+                chunk = rows[start:start + chunk_rows]
+                block = vectors[chunk].astype(np.float32) * scales[chunk][:, None]
+                scores[:, columns[start:start + chunk_rows]] = queries @ block.T
+        return scores
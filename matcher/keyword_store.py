@@ -0,0 +1,105 @@
+# matcher/keyword_store.py
+
+import hashlib
+import os
+import time
+
+import numpy as np
+
+from sqlite_store import SQLiteStore
+
+STORE_PATH = os.getenv("KEYWORD_STORE_PATH", "data/job_keywords.db")
+SQLITE_MAX_VARS = 500  # stay well below SQLite's bound-parameter limit
+
+
+def content_hash(text):
+    """SHA-256 of the posting text, used as the store key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class KeywordStore(SQLiteStore):
+    """
+    Persistent, content-hash-keyed store of KeyBERT keywords for job postings.
+    (Document embeddings now live in the memory-mapped EmbeddingFile; the
+    job_embedding table is only read to move older rows over.)
+
+    Each unique posting is processed once and reused across requests, users
+    and restarts. One SQLite connection is kept per thread (see SQLiteStore).
+    """
+
+    def __init__(self, path=STORE_PATH):
+        super().__init__(path)
+
+    def _create_schema(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_keywords (
+                hash TEXT NOT NULL,
+                num_keywords INTEGER NOT NULL,
+                keywords TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (hash, num_keywords)
+            )
+        """)
+        # Legacy float32 embeddings, emptied as map_job_embeddings moves them to the embedding file
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_embedding (
+                hash TEXT PRIMARY KEY,
+                embedding BLOB NOT NULL,
+                dim INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+
+    def get_many(self, hashes, num_keywords=30):
+        """Returns {hash: keywords} for every hash already in the store."""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        conn = self._conn()
+        for i in range(0, len(unique), SQLITE_MAX_VARS):
+            chunk = unique[i:i + SQLITE_MAX_VARS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT hash, keywords FROM job_keywords "
+                f"WHERE num_keywords = ? AND hash IN ({placeholders})",
+                [num_keywords, *chunk],
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def get_embeddings(self, hashes):
+        """Returns {hash: np.ndarray} for every hash that still has a legacy stored embedding."""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        conn = self._conn()
+        for i in range(0, len(unique), SQLITE_MAX_VARS):
+            chunk = unique[i:i + SQLITE_MAX_VARS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT hash, embedding FROM job_embedding WHERE hash IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            for h, blob in rows:
+                found[h] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, entries, num_keywords=30):
+        """Stores (hash, keywords) pairs; existing rows are left untouched."""
+        now = time.time()
+        conn = self._conn()
+        conn.executemany(
+            "INSERT OR IGNORE INTO job_keywords (hash, num_keywords, keywords, created_at) VALUES (?, ?, ?, ?)",
+            [(h, num_keywords, keywords, now) for h, keywords in entries],
+        )
+        conn.commit()
+
+    def delete_embeddings(self, hashes):
+        """Drops legacy embeddings once they are in the embedding file."""
+        conn = self._conn()
+        for i in range(0, len(hashes), SQLITE_MAX_VARS):
+            chunk = hashes[i:i + SQLITE_MAX_VARS]
+            placeholders = ",".join("?" * len(chunk))
+            conn.execute(f"DELETE FROM job_embedding WHERE hash IN ({placeholders})", chunk)
+        conn.commit()
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM job_keywords").fetchone()[0]
@@ -0,0 +1,192 @@
+# matcher/result_store.py
+
+import csv
+import io
+import os
+import secrets
+import sqlite3
+import time
+
+from sqlite_store import SQLiteStore
+
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH", "data/search_results.db")
+RESULT_TTL = int(os.getenv("RESULT_TTL", "7200"))  # searches expire after 2 hours
+RESULT_FIELDS = ["title", "company", "location", "description", "match_score", "link"]
+PENDING_TIMEOUT = 900  # queued/running searches older than this are reported as failed
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class ResultStore(SQLiteStore):
+    """
+    Per-user, per-search storage of match results, shared by all workers.
+
+    Each search gets a random ID; its rows are stored once with their rank,
+    so a results page or a single job is one indexed range read and CSV
+    downloads are streamed row by row. Searches older than `ttl` are purged.
+
+    A search can be created before its results exist (status "queued", then
+    "running", then "done" or "failed"), so any worker can answer a status poll.
+    """
+
+    row_factory = sqlite3.Row
+
+    def __init__(self, path=RESULT_STORE_PATH, ttl=RESULT_TTL):
+        self.ttl = ttl
+        super().__init__(path)
+
+    def _create_schema(self, conn):
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS search (
+                search_id TEXT PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'done',
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS ix_search_created_at ON search (created_at);
+            CREATE TABLE IF NOT EXISTS search_result (
+                search_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                title TEXT, company TEXT, location TEXT, description TEXT,
+                match_score REAL, link TEXT,
+                PRIMARY KEY (search_id, position)
+            ) WITHOUT ROWID;
+        """)
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(search)")}
+        if "status" not in columns:
+            conn.execute("ALTER TABLE search ADD COLUMN status TEXT NOT NULL DEFAULT 'done'")
+            conn.execute("ALTER TABLE search ADD COLUMN error TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_search_user_status ON search (user_id, status)")
+
+    def save(self, user_id, matches_df):
+        """Stores a search's ranked matches and returns its new search ID."""
+        search_id = self.create(user_id)
+        self.complete(search_id, matches_df)
+        return search_id
+
+    def create(self, user_id, max_active=None):
+        """
+        Registers a queued search and returns its ID, or None if the user
+        already has `max_active` searches queued or running.
+        """
+        search_id = secrets.token_urlsafe(12)
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")  # count and insert atomically across workers
+        try:
+            if max_active is not None:
+                active = conn.execute(
+                    f"SELECT COUNT(*) FROM search WHERE user_id = ? AND created_at >= ? "
+                    f"AND status IN ({','.join('?' * len(ACTIVE_STATUSES))})",
+                    (user_id, now - PENDING_TIMEOUT, *ACTIVE_STATUSES),
+                ).fetchone()[0]
+                if active >= max_active:
+                    conn.rollback()
+                    return None
+            conn.execute(
+                "INSERT INTO search (search_id, user_id, created_at, total, status) VALUES (?, ?, ?, 0, 'queued')",
+                (search_id, user_id, now),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return search_id
+
+    def set_status(self, search_id, status, error=None):
+        conn = self._conn()
+        with conn:
+            conn.execute("UPDATE search SET status = ?, error = ? WHERE search_id = ?", (status, error, search_id))
+
+    def complete(self, search_id, matches_df):
+        """Stores the ranked matches of a created search and marks it done."""
+        rows = [
+            (search_id, position, *[record.get(field) for field in RESULT_FIELDS])
+            for position, record in enumerate(matches_df[RESULT_FIELDS].to_dict(orient="records"))
+        ]
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT INTO search_result (search_id, position, title, company, location, description, "
+                "match_score, link) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "UPDATE search SET total = ?, status = 'done', error = NULL WHERE search_id = ?",
+                (len(rows), search_id),
+            )
+        self.purge_expired()
+
+    def status(self, search_id, user_id):
+        """{"status", "total", "error"} for the user's search, or None if unknown/expired."""
+        if not search_id:
+            return None
+        row = self._conn().execute(
+            "SELECT status, total, error, created_at FROM search "
+            "WHERE search_id = ? AND user_id = ? AND created_at >= ?",
+            (search_id, user_id, time.time() - self.ttl),
+        ).fetchone()
+        if row is None:
+            return None
+        status, error = row["status"], row["error"]
+        if status in ACTIVE_STATUSES and row["created_at"] < time.time() - PENDING_TIMEOUT:
+            # The worker running it died or hung
+            status, error = "failed", "Search timed out"
+        return {"status": status, "total": row["total"], "error": error}
+
+    def _search(self, search_id, user_id):
+        if not search_id:
+            return None
+        return self._conn().execute(
+            "SELECT total FROM search WHERE search_id = ? AND user_id = ? AND created_at >= ?",
+            (search_id, user_id, time.time() - self.ttl),
+        ).fetchone()
+
+    def total(self, search_id, user_id):
+        """Number of results in the search, or None if it is unknown/expired/not the user's."""
+        search = self._search(search_id, user_id)
+        return search["total"] if search else None
+
+    def page(self, search_id, user_id, start, count):
+        """Results [start, start + count) of the search as dicts."""
+        if self._search(search_id, user_id) is None:
+            return []
+        rows = self._conn().execute(
+            "SELECT * FROM search_result WHERE search_id = ? AND position >= ? AND position < ? ORDER BY position",
+            (search_id, start, start + count),
+        ).fetchall()
+        return [{field: row[field] for field in RESULT_FIELDS} for row in rows]
+
+    def get(self, search_id, user_id, position):
+        rows = self.page(search_id, user_id, position, 1)
+        return rows[0] if rows else None
+
+    def iter_csv(self, search_id, user_id):
+        """Yields the search's results as CSV text, one row at a time."""
+        if self._search(search_id, user_id) is None:
+            return
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(RESULT_FIELDS)
+        yield buffer.getvalue()
+
+        cursor = self._conn().execute(
+            "SELECT * FROM search_result WHERE search_id = ? ORDER BY position", (search_id,)
+        )
+        for row in cursor:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow([row[field] for field in RESULT_FIELDS])
+            yield buffer.getvalue()
+
+    def purge_expired(self):
+        conn = self._conn()
+        with conn:
+            expired = [row[0] for row in conn.execute(
+                "SELECT search_id FROM search WHERE created_at < ?", (time.time() - self.ttl,)
+            )]
+            for search_id in expired:
+                conn.execute("DELETE FROM search_result WHERE search_id = ?", (search_id,))
+                conn.execute("DELETE FROM search WHERE search_id = ?", (search_id,))
@@ -0,0 +1,133 @@
+# matcher/resume_cache.py
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "256"))
+
+
+def file_hash(path):
+    """SHA-256 of the file bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResumeCache:
+    """
+    LRU cache of extracted resume text, KeyBERT keywords and embeddings,
+    keyed by SHA-256 of the resume file bytes.
+
+    The loaders are passed in so this module does not depend on the
+    matcher: extract_text(path), extract_keywords(text, num_keywords)
+    and embed(texts).
+    """
+
+    def __init__(self, extract_text, extract_keywords, embed=None, max_entries=RESUME_CACHE_SIZE):
+        self._extract_text = extract_text
+        self._extract_keywords = extract_keywords
+        self._embed = embed
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # file hash -> {"text", "keywords", "embedding"}
+        self._by_text = {}  # text hash -> file hash
+        self._path_hashes = {}  # path -> (mtime_ns, size, file hash)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _hash_for(self, path):
+        """File hash, re-read only when the file's mtime or size changed."""
+        stat = os.stat(path)
+        with self._lock:
+            known = self._path_hashes.get(path)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return known[2]
+        digest = file_hash(path)  # hashed outside the lock; other threads keep going
+        with self._lock:
+            self._path_hashes[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def _entry(self, path):
+        digest = self._hash_for(path)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = {"text": self._extract_text(path), "keywords": {}, "embedding": None}
+        with self._lock:
+            self._entries[digest] = entry
+            self._by_text[text_hash(entry["text"])] = digest
+            while len(self._entries) > self.max_entries:
+                old_digest, old_entry = self._entries.popitem(last=False)
+                self._by_text.pop(text_hash(old_entry["text"]), None)
+                for old_path in [p for p, known in self._path_hashes.items() if known[2] == old_digest]:
+                    del self._path_hashes[old_path]
+        return entry
+
+    def get_text(self, path):
+        return self._entry(path)["text"]
+
+    def get_keywords(self, path, num_keywords=30):
+        entry = self._entry(path)
+        if num_keywords not in entry["keywords"]:
+            entry["keywords"][num_keywords] = self._extract_keywords(entry["text"], num_keywords)
+        return entry["keywords"][num_keywords]
+
+    def get_embedding(self, path):
+        entry = self._entry(path)
+        if entry["embedding"] is None and self._embed is not None:
+            entry["embedding"] = self._embed([entry["text"]])[0]
+        return entry["embedding"]
+
+    def keywords_for_text(self, text, num_keywords=30):
+        """Keywords for text already extracted from a cached resume, else None."""
+        with self._lock:
+            digest = self._by_text.get(text_hash(text))
+            entry = self._entries.get(digest) if digest else None
+        if entry is None:
+            return None
+        if num_keywords not in entry["keywords"]:
+            entry["keywords"][num_keywords] = self._extract_keywords(entry["text"], num_keywords)
+        return entry["keywords"][num_keywords]
+
+    def embedding_for_text(self, text):
+        """Embedding for text already extracted from a cached resume, else None."""
+        with self._lock:
+            digest = self._by_text.get(text_hash(text))
+            entry = self._entries.get(digest) if digest else None
+        if entry is None or self._embed is None:
+            return None
+        if entry["embedding"] is None:
+            entry["embedding"] = self._embed([entry["text"]])[0]
+        return entry["embedding"]
+
+    def warm(self, path, num_keywords=30):
+        """Extracts and caches text and keywords, e.g. right after upload."""
+        self.get_keywords(path, num_keywords)
+
+    def evict(self, path):
+        """Drops the cached entry for a resume file (call before deleting it)."""
+        with self._lock:
+            known = self._path_hashes.pop(path, None)
+        if known:
+            digest = known[2]
+        elif os.path.exists(path):
+            digest = file_hash(path)
+        else:
+            return
+        with self._lock:
+            entry = self._entries.pop(digest, None)
+            if entry is not None:
+                self._by_text.pop(text_hash(entry["text"]), None)
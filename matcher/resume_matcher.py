@@ -1,26 +1,83 @@
-import fitz  # PyMuPDF
-import pandas as pd
-from keybert import KeyBERT
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-# Initialize KeyBERT once
-kw_model = KeyBERT()
-
-def extract_text_from_pdf(pdf_path):
-    """Extracts all text from a PDF file."""
-    text = ""
-    doc = fitz.open(pdf_path)
-    for page in doc:
-        text += page.get_text()
-    return text
+import os
+import threading
+import time
 
+import numpy as np
+from matcher.embedding_file import EmbeddingFile
+from matcher.keyword_store import KeywordStore, content_hash
+from matcher.resume_cache import ResumeCache
+from matcher.text_prefilter import InvertedIndex
+from matcher.tfidf_corpus import TfidfCorpus
+from matcher.vector_index import build_index
+from resume_parser.resume_parser import extract_text_from_pdf
+from scraper.job_store import job_store
+from telemetry.metrics import timed, timed_function
+
+# KeyBERT (and the transformer behind it) is loaded on first use or by warm_up()
+_kw_model = None
+_kw_model_lock = threading.Lock()
+model_load_seconds = None
+
+# Persistent keyword store for job postings (shared across requests and restarts)
+keyword_store = KeywordStore()
+
+# Quantized, memory-mapped job embeddings used for dense scoring (shared by all workers via the page cache)
+job_embedding_file = EmbeddingFile()
+
+# Long-lived TF-IDF models over job full text and job KeyBERT keywords
+full_text_corpus = TfidfCorpus(stop_words="english")
+keyword_corpus = TfidfCorpus(stop_words=None)
+
+# "hybrid" (TF-IDF + KeyBERT keywords) or "dense" (sentence embeddings)
+MATCH_MODE = os.getenv("MATCH_MODE", "hybrid")
+
+# Full-text prefilter: large job sets are cut to the postings sharing the most terms with
+# the resume before any TF-IDF/KeyBERT/embedding work. Larger shortlists keep more of the
+# exhaustive top-n (see evaluate_prefilter) at proportionally higher scoring cost.
+PREFILTER_MIN_JOBS = int(os.getenv("PREFILTER_MIN_JOBS", "2000"))  # smaller job sets are not prefiltered
+PREFILTER_SHORTLIST = int(os.getenv("PREFILTER_SHORTLIST", "1000"))  # postings kept per resume; 0 disables
+PREFILTER_QUERY_TERMS = int(os.getenv("PREFILTER_QUERY_TERMS", "32"))  # resume terms used as the query
+job_text_index = InvertedIndex()
+
+# Approximate nearest-neighbour index over job embeddings, used to shortlist large job sets
+ANN_MIN_JOBS = 5000  # smaller job sets are scored exhaustively
+ANN_CANDIDATE_FACTOR = 20  # shortlist size per resume = top_n * factor
+job_index = None  # created on first use, sized from the first large job set
+job_index_lock = threading.Lock()
+
+def get_kw_model():
+    """Returns the shared KeyBERT model, loading it on first call."""
+    global _kw_model, model_load_seconds
+    if _kw_model is None:
+        with _kw_model_lock:
+            if _kw_model is None:
+                start = time.perf_counter()
+                from keybert import KeyBERT
+                _kw_model = KeyBERT()
+                model_load_seconds = time.perf_counter() - start
+                print(f"🧠 KeyBERT loaded in {model_load_seconds:.1f}s")
+    return _kw_model
+
+def warm_up(encode=True):
+    """
+    Loads the model and runs one tiny encode so the first request does not pay
+    for it. Call it from a background thread, or in a gunicorn preload parent
+    so forked workers share the loaded weights copy-on-write (there, pass
+    encode=False: the encoder's thread pool does not survive a fork).
+    """
+    start = time.perf_counter()
+    get_kw_model()
+    if encode:
+        embed_texts(["warm up"])
+    return time.perf_counter() - start
+
+@timed_function("keybert")
 def extract_keywords_text(text, num_keywords=30):
     """
     Extracts top keywords from text using KeyBERT and joins them into a single string.
     This is used for TF-IDF + Cosine similarity matching.
     """
-    keywords = kw_model.extract_keywords(
+    keywords = get_kw_model().extract_keywords(
         text,
         keyphrase_ngram_range=(1, 2),
         stop_words="english",
@@ -28,37 +85,369 @@ def extract_keywords_text(text, num_keywords=30):
     )
     return " ".join([kw[0] for kw in keywords])
 
-def match_resume_with_jobs(resume_text, jobs_df=None, jobs_csv="data/rozee_jobs.csv", top_n=5):
+@timed_function("keybert")
+def extract_keywords_batch(texts, num_keywords=30, batch_size=64, return_embeddings=False):
+    """
+    Batched version of extract_keywords_text.
+    Documents and candidate phrases are embedded in large encoder calls
+    (one per batch of `batch_size` texts) instead of one forward pass per text.
+    Returns a list of keyword strings, plus the document embeddings if
+    `return_embeddings` is True.
+    """
+    keyword_texts = [""] * len(texts)
+    embeddings = [None] * len(texts)
+
+    # KeyBERT cannot build a vocabulary from empty documents
+    indices = [i for i, text in enumerate(texts) if text and text.strip()]
+
+    for start in range(0, len(indices), batch_size):
+        batch_idx = indices[start:start + batch_size]
+        batch = [texts[i] for i in batch_idx]
+
+        kw_model = get_kw_model()
+        doc_embeddings, word_embeddings = kw_model.extract_embeddings(
+            batch,
+            keyphrase_ngram_range=(1, 2),
+            stop_words="english"
+        )
+        keywords = kw_model.extract_keywords(
+            batch,
+            keyphrase_ngram_range=(1, 2),
+            stop_words="english",
+            top_n=num_keywords,
+            doc_embeddings=doc_embeddings,
+            word_embeddings=word_embeddings
+        )
+        # KeyBERT unwraps the result when given a single document
+        if len(batch) == 1:
+            keywords = [keywords]
+
+        for j, i in enumerate(batch_idx):
+            keyword_texts[i] = " ".join([kw[0] for kw in keywords[j]])
+            embeddings[i] = doc_embeddings[j]
+
+    if return_embeddings:
+        return keyword_texts, embeddings
+    return keyword_texts
+
+def get_job_keywords(texts, num_keywords=30):
+    """
+    Returns KeyBERT keyword strings for a list of job texts.
+    Postings already seen (by content hash) are read from the keyword store;
+    only new postings go through KeyBERT, and their keywords are saved.
+    """
+    hashes = [content_hash(text) for text in texts]
+    cached = keyword_store.get_many(hashes, num_keywords)
+
+    missing = {}
+    for h, text in zip(hashes, texts):
+        if h not in cached and h not in missing:
+            missing[h] = text
+
+    if missing:
+        print(f"🧠 Extracting keywords for {len(missing)} new postings ({len(cached)} cached)")
+        keywords, embeddings = extract_keywords_batch(
+            list(missing.values()), num_keywords, return_embeddings=True
+        )
+        keyword_store.put_many(zip(missing.keys(), keywords), num_keywords)
+        # The document embeddings come for free here; keep them for dense scoring and the ANN shortlist
+        embedded = [(h, e) for h, e in zip(missing.keys(), embeddings) if e is not None]
+        if embedded:
+            job_embedding_file.append([h for h, _ in embedded], np.stack([e for _, e in embedded]))
+        cached.update(zip(missing.keys(), keywords))
+
+    return [cached[h] for h in hashes]
+
+@timed_function("embed")
+def embed_texts(texts):
+    """Dense sentence embeddings from the encoder KeyBERT already loaded."""
+    return np.asarray(get_kw_model().model.embed(texts), dtype=np.float32)
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+def map_job_embeddings(texts, hashes):
+    """
+    Makes sure every posting has a vector in the memory-mapped embedding file.
+    Vectors left in the keyword store's legacy float32 table are moved over
+    instead of being re-embedded; the rest are embedded in one batch.
+    """
+    missing = {}
+    for h, text in zip(hashes, texts):
+        if h not in job_embedding_file and h not in missing:
+            missing[h] = text
+    if missing:
+        job_embedding_file.refresh()  # another worker may have written them already
+        missing = {h: text for h, text in missing.items() if h not in job_embedding_file}
+    if not missing:
+        return
+
+    legacy = keyword_store.get_embeddings(list(missing))
+    to_embed = [h for h in missing if h not in legacy]
+    vectors = dict(legacy)
+    if to_embed:
+        vectors.update(zip(to_embed, embed_texts([missing[h] for h in to_embed])))
+    keys = list(missing)
+    job_embedding_file.append(keys, np.stack([vectors[h] for h in keys]))
+    if legacy:
+        keyword_store.delete_embeddings(list(legacy))
+
+@timed_function("ann_shortlist")
+def shortlist_jobs(resume_texts, job_texts, job_keys, k):
+    """
+    Returns the keys of the k postings nearest to each resume (union over resumes),
+    found through the ANN job index. The index only holds keys; candidates are
+    scored on the memory-mapped embedding file, so no float32 copy of the job
+    vectors is kept in the heap.
+    """
+    global job_index
+    map_job_embeddings(job_texts, job_keys)
+
+    with job_index_lock:
+        if job_index is None:
+            job_index = build_index(job_embedding_file, expected_size=len(job_keys))
+        job_index.add(job_keys)
+
+    allowed = {key for key in job_keys if key in job_index}
+    keep = set(job_keys) - allowed  # never drop a posting unranked
+    for query in get_resume_embeddings(resume_texts):
+        keys, _ = job_index.search(query, k, allowed=allowed)
+        keep.update(keys)
+    return keep
+
+@timed_function("prefilter")
+def prefilter_jobs(resume_texts, job_texts, job_keys, k, num_terms=None):
+    """
+    Returns the keys of the k postings that best match each resume's top terms
+    (BM25 over the in-process inverted index, union over resumes). Only
+    postings new to the index are tokenized.
+    """
+    job_text_index.add_many(job_keys, job_texts)
+    return job_text_index.shortlist(resume_texts, job_keys, k, num_terms or PREFILTER_QUERY_TERMS)
+
+def keep_jobs(df, job_texts, job_keys, keep):
+    """df, texts and keys restricted to the postings whose key is in `keep`."""
+    mask = [key in keep for key in job_keys]
+    return (
+        df[mask],
+        [text for text, kept in zip(job_texts, mask) if kept],
+        [key for key, kept in zip(job_keys, mask) if kept],
+    )
+
+# Resume text, keywords and embeddings keyed by SHA-256 of the file bytes
+resume_cache = ResumeCache(extract_text_from_pdf, extract_keywords_text, embed_texts)
+
+def get_resume_keywords(resume_texts, num_keywords=30):
+    """KeyBERT keywords per resume text, reusing cached resumes; the rest go in one batch."""
+    keywords = [resume_cache.keywords_for_text(text, num_keywords) for text in resume_texts]
+    missing = [i for i, kw in enumerate(keywords) if kw is None]
+    if missing:
+        computed = extract_keywords_batch([resume_texts[i] for i in missing], num_keywords)
+        for i, kw in zip(missing, computed):
+            keywords[i] = kw
+    return keywords
+
+def get_resume_embeddings(resume_texts):
+    """Dense embeddings per resume text, reusing cached resumes."""
+    embeddings = [resume_cache.embedding_for_text(text) for text in resume_texts]
+    missing = [i for i, emb in enumerate(embeddings) if emb is None]
+    if missing:
+        computed = embed_texts([resume_texts[i] for i in missing])
+        for i, emb in zip(missing, computed):
+            embeddings[i] = emb
+    return np.stack(embeddings)
+
+RESULT_COLUMNS = ["title", "company", "location", "description", "match_score", "link"]
+JOB_COLUMNS = [column for column in RESULT_COLUMNS if column != "match_score"]
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores, best first, without sorting the whole array."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+def match_resume_with_jobs(resume_text, jobs_df=None, jobs_csv=None, top_n=5, mode=None):
     """
-    Matches resume against job postings using a hybrid of:
+    Matches resume against job postings. The default "hybrid" mode combines:
     - TF-IDF on full text
     - Cosine similarity on extracted KeyBERT keywords
+    "dense" mode scores sentence embeddings directly (see score_jobs).
+    """
+    return match_resumes_with_jobs([resume_text], jobs_df=jobs_df, jobs_csv=jobs_csv, top_n=top_n, mode=mode)[0]
+
+@timed_function("load_jobs")
+def load_jobs(jobs_df=None, jobs_csv=None):
+    """
+    Job postings with a `combined` title + description column: `jobs_df` if
+    given, else only the columns matching needs, read from `jobs_csv` or by
+    default from the persistent job store.
     """
-    # Load job data
     if jobs_df is not None:
         df = jobs_df.copy()
+    elif jobs_csv is not None:
+        import pandas as pd
+        df = pd.read_csv(jobs_csv, usecols=lambda column: column in JOB_COLUMNS)
     else:
-        df = pd.read_csv(jobs_csv)
-
+        df = job_store.load(columns=JOB_COLUMNS)
     df["combined"] = df["title"].fillna("") + " " + df["description"].fillna("")
+    return df
+
+def score_jobs(resume_texts, job_texts, job_keys, mode=None):
+    """
+    (resumes x jobs) match scores on a 0-100 scale.
+    - "hybrid": TF-IDF on full text + TF-IDF on KeyBERT keywords, averaged.
+    - "dense": cosine of sentence embeddings from the KeyBERT encoder, computed
+      once per job and once per resume. Job vectors are read from the quantized,
+      memory-mapped embedding file and scored in chunks, so the corpus is never
+      loaded into each worker's heap.
+    """
+    mode = mode or MATCH_MODE
+    if not job_texts:
+        return np.zeros((len(resume_texts), 0))
+
+    if mode == "dense":
+        map_job_embeddings(job_texts, job_keys)
+        resume_embeddings = get_resume_embeddings(resume_texts)
+        with timed("dense_score"):
+            return np.clip(job_embedding_file.score(resume_embeddings, job_keys), 0, 1) * 100
+
+    if mode != "hybrid":
+        raise ValueError(f"Unknown matching mode: {mode}")
 
     # -------- TF-IDF on full text --------
-    documents_full = [resume_text] + df["combined"].tolist()
-    tfidf_vectorizer = TfidfVectorizer(stop_words="english")
-    tfidf_matrix = tfidf_vectorizer.fit_transform(documents_full)
-    tfidf_scores = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
+    # Only postings new to the corpus are tokenized; resumes are scored with one sparse product
+    with timed("tfidf"):
+        full_text_corpus.add_many(job_keys, job_texts)
+        tfidf_scores = full_text_corpus.similarity_matrix(resume_texts, job_keys)
 
     # -------- KeyBERT similarity --------
-    resume_keywords_text = extract_keywords_text(resume_text)
-    job_keywords_texts = df["combined"].apply(extract_keywords_text).tolist()
-    documents_keywords = [resume_keywords_text] + job_keywords_texts
-    tfidf_kw = TfidfVectorizer()
-    tfidf_kw_matrix = tfidf_kw.fit_transform(documents_keywords)
-    keybert_scores = cosine_similarity(tfidf_kw_matrix[0:1], tfidf_kw_matrix[1:]).flatten()
+    resume_keywords_texts = get_resume_keywords(resume_texts)
+    job_keywords_texts = get_job_keywords(job_texts)
+    with timed("keyword_tfidf"):
+        keyword_corpus.add_many(job_keys, job_keywords_texts)
+        keybert_scores = keyword_corpus.similarity_matrix(resume_keywords_texts, job_keys)
 
     # -------- Combine Scores --------
-    df["match_score"] = (tfidf_scores * 0.5 + keybert_scores * 0.5) * 100
+    return (tfidf_scores * 0.5 + keybert_scores * 0.5) * 100
+
+@timed_function("match")
+def match_resumes_with_jobs(resume_texts, jobs_df=None, jobs_csv=None, top_n=5, mode=None):
+    """
+    Batch version of match_resume_with_jobs.
+    All resumes are vectorized at once and scored against the jobs in one
+    product per score; returns one top-n DataFrame per resume.
+    """
+    df = load_jobs(jobs_df, jobs_csv)
+    job_texts = df["combined"].tolist()
+    job_keys = [content_hash(text) for text in job_texts]
+
+    # -------- Full-text prefilter for large job sets --------
+    if PREFILTER_SHORTLIST > 0 and len(df) >= PREFILTER_MIN_JOBS:
+        keep = prefilter_jobs(resume_texts, job_texts, job_keys, max(PREFILTER_SHORTLIST, top_n))
+        total = len(df)
+        df, job_texts, job_keys = keep_jobs(df, job_texts, job_keys, keep)
+        print(f"🔎 Full-text prefilter: {len(df)} of {total} postings")
+
+    # -------- ANN shortlist for large job sets --------
+    if len(df) >= ANN_MIN_JOBS:
+        keep = shortlist_jobs(resume_texts, job_texts, job_keys, top_n * ANN_CANDIDATE_FACTOR)
+        total = len(df)
+        df, job_texts, job_keys = keep_jobs(df, job_texts, job_keys, keep)
+        print(f"🔎 ANN shortlist: {len(df)} of {total} postings")
+
+    match_scores = score_jobs(resume_texts, job_texts, job_keys, mode)
+
+    results = []
+    with timed("ranking"):
+        for scores in match_scores:
+            top = top_k_indices(scores, top_n)
+            top_matches = df.iloc[top].copy()
+            top_matches["match_score"] = scores[top]
+            results.append(top_matches[RESULT_COLUMNS])
+    return results
+
+def compare_matching_modes(resume_texts, jobs_df=None, jobs_csv=None, top_n=10):
+    """
+    Runs the hybrid and dense modes on the same input and reports their latency
+    and how much their rankings agree:
+    - top_n_overlap: mean share of each resume's top-n jobs found by both modes
+    - spearman: mean rank correlation of the full score vectors
+    Each mode is run twice and the second (warm) run is timed, so one-off
+    keyword/embedding extraction does not skew the comparison.
+    """
+    from scipy.stats import spearmanr
+
+    df = load_jobs(jobs_df, jobs_csv)
+    job_texts = df["combined"].tolist()
+    job_keys = [content_hash(text) for text in job_texts]
+
+    report = {"jobs": len(job_texts), "resumes": len(resume_texts)}
+    scores = {}
+    for mode in ("hybrid", "dense"):
+        start = time.perf_counter()
+        score_jobs(resume_texts, job_texts, job_keys, mode)
+        report[f"{mode}_cold_seconds"] = time.perf_counter() - start
+        start = time.perf_counter()
+        scores[mode] = score_jobs(resume_texts, job_texts, job_keys, mode)
+        report[f"{mode}_seconds"] = time.perf_counter() - start
+
+    overlaps, correlations = [], []
+    for hybrid, dense in zip(scores["hybrid"], scores["dense"]):
+        top_hybrid = set(top_k_indices(hybrid, top_n))
+        top_dense = set(top_k_indices(dense, top_n))
+        overlaps.append(len(top_hybrid & top_dense) / max(1, min(top_n, len(hybrid))))
+        if len(hybrid) > 1:
+            correlations.append(spearmanr(hybrid, dense).correlation)
+
+    report["top_n_overlap"] = float(np.mean(overlaps)) if overlaps else 0.0
+    report["spearman"] = float(np.nanmean(correlations)) if correlations else 0.0
+
+    print(
+        f"⏱️ hybrid {report['hybrid_seconds'] * 1000:.1f} ms | dense {report['dense_seconds'] * 1000:.1f} ms | "
+        f"top-{top_n} overlap {report['top_n_overlap']:.0%} | spearman {report['spearman']:.2f}"
+    )
+    return report
+
+def evaluate_prefilter(resume_texts, jobs_df=None, jobs_csv=None, top_n=10, shortlist_sizes=(100, 250, 500, 1000, 2000),
+                       mode=None):
+    """
+    Reports the full-text prefilter's recall / shortlist-size trade-off: every
+    job is scored exhaustively once, then for each shortlist size the report
+    gives the mean share of each resume's exhaustive top-n that survives the
+    prefilter, the share of the corpus kept and the prefilter's latency.
+    Use it to pick PREFILTER_SHORTLIST for a corpus.
+    """
+    df = load_jobs(jobs_df, jobs_csv)
+    job_texts = df["combined"].tolist()
+    job_keys = [content_hash(text) for text in job_texts]
+    job_text_index.add_many(job_keys, job_texts)
 
-    top_matches = df.sort_values(by="match_score", ascending=False).head(top_n)
+    exhaustive = score_jobs(resume_texts, job_texts, job_keys, mode)
+    reference = [{job_keys[i] for i in top_k_indices(scores, top_n)} for scores in exhaustive]
 
-    return top_matches[["title", "company", "location", "description", "match_score", "link"]]
+    report = {"jobs": len(job_keys), "resumes": len(resume_texts), "top_n": top_n, "sizes": []}
+    for size in shortlist_sizes:
+        start = time.perf_counter()
+        shortlists = [prefilter_jobs([text], job_texts, job_keys, size) for text in resume_texts]
+        seconds = time.perf_counter() - start
+        recalls = [len(top & kept) / len(top) for top, kept in zip(reference, shortlists) if top]
+        entry = {
+            "shortlist": size,
+            "recall": float(np.mean(recalls)) if recalls else 1.0,
+            "kept_share": float(np.mean([len(kept) for kept in shortlists])) / max(1, len(job_keys)),
+            "seconds_per_resume": seconds / max(1, len(resume_texts)),
+        }
+        report["sizes"].append(entry)
+        print(
+            f"🔎 prefilter {size}: recall@{top_n} {entry['recall']:.0%} | "
+            f"keeps {entry['kept_share']:.1%} of {len(job_keys)} jobs | "
+            f"{entry['seconds_per_resume'] * 1000:.1f} ms per resume"
+        )
+    return report
@@ -0,0 +1,69 @@
+# matcher/search_queue.py
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from telemetry.metrics import finish_trace, start_trace
+from telemetry.profiler import maybe_profiled
+
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "4"))
+SEARCH_PER_USER = int(os.getenv("SEARCH_PER_USER", "2"))  # queued + running searches per user
+
+
+class SearchQueue:
+    """
+    Runs searches (scrape + match) on a local worker pool instead of in the request.
+
+    submit() registers the search in the ResultStore and returns its ID at once;
+    the worker stores the ranked matches (or the error) under that ID, so the
+    results page can poll the store from any worker process. The per-user limit
+    is checked against the store, so it holds across gunicorn workers too.
+    """
+
+    def __init__(self, result_store, workers=SEARCH_WORKERS, per_user=SEARCH_PER_USER):
+        self.result_store = result_store
+        self.per_user = per_user
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search")
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+
+    def submit(self, user_id, func, *args, profile=False, **kwargs):
+        """
+        Queues func(*args, **kwargs), which must return a matches DataFrame.
+        Returns the search ID, or None if the user is at their limit.
+        With `profile`, the search runs under the profiler.
+        """
+        search_id = self.result_store.create(user_id, max_active=self.per_user)
+        with self._lock:
+            self.stats["rejected" if search_id is None else "submitted"] += 1
+        if search_id is None:
+            return None
+        self._executor.submit(self._run, search_id, func, args, kwargs, profile)
+        return search_id
+
+    def run_in_background(self, func, *args):
+        """Runs func(*args) on the search pool without storing a result, e.g. a cache warm-up."""
+        self._executor.submit(self._run_quietly, func, args)
+
+    def _run_quietly(self, func, args):
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"⚠️ Background task {getattr(func, '__name__', func)} failed: {e}")
+
+    def _run(self, search_id, func, args, kwargs, profile=False):
+        start_trace(kind="search", search_id=search_id, task=getattr(func, "__name__", str(func)))
+        self.result_store.set_status(search_id, "running")
+        try:
+            with maybe_profiled(profile, "search", search_id):
+                matches = func(*args, **kwargs)
+            self.result_store.complete(search_id, matches)
+            outcome = "completed"
+        except Exception as e:
+            print(f"⚠️ Search {search_id} failed: {e}")
+            self.result_store.set_status(search_id, "failed", str(e))
+            outcome = "failed"
+        with self._lock:
+            self.stats[outcome] += 1
+        finish_trace(status=outcome)
@@ -0,0 +1,171 @@
+# matcher/text_prefilter.py
+
+import threading
+from collections import Counter
+from itertools import islice
+
+import numpy as np
+
+MAX_INDEX_DOCS = 50000  # least recently used postings are dropped beyond this, like TfidfCorpus
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class InvertedIndex:
+    """
+    In-process posting-list index over job text, used as a cheap first stage
+    before TF-IDF/KeyBERT/embedding scoring.
+
+    Each posting is tokenized once when added. A query takes a resume's top
+    terms (by tf-idf against the indexed postings) and scores postings with
+    BM25 by walking only those terms' posting lists; no model is involved.
+    """
+
+    def __init__(self, stop_words="english", max_docs=MAX_INDEX_DOCS):
+        self.stop_words = stop_words
+        self.max_docs = max_docs
+        self._analyzer = None  # sklearn is imported on first use
+        self._slot_of = {}  # key -> slot
+        self._keys = []  # slot -> key (None once removed)
+        self._lengths = []  # slot -> number of tokens
+        self._terms = []  # slot -> term list, so removal can update document frequencies
+        self._postings = {}  # term -> ([slots], [term counts])
+        self._arrays = {}  # term -> (slots array, counts array), rebuilt lazily
+        self._doc_freq = Counter()
+        self._total_length = 0
+        self._removed = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def __contains__(self, key):
+        return key in self._slot_of
+
+    def _tokens(self, text):
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+            self._analyzer = CountVectorizer(stop_words=self.stop_words).build_analyzer()
+        return self._analyzer(text or "")
+
+    # -------- Index updates --------
+
+    def add_many(self, keys, texts):
+        """
+        Indexes postings whose key is not in the index yet. Postings passed in
+        are marked as recently used and are never evicted by this call, even if
+        the batch alone is larger than max_docs.
+        """
+        with self._lock:
+            for key, text in zip(keys, texts):
+                slot = self._slot_of.pop(key, None)
+                if slot is not None:
+                    self._slot_of[key] = slot  # move to the back of the eviction order
+                    continue
+                tokens = self._tokens(text)
+                slot = len(self._keys)
+                self._slot_of[key] = slot
+                self._keys.append(key)
+                self._lengths.append(len(tokens))
+                counts = Counter(tokens)
+                self._terms.append(list(counts))
+                for term, count in counts.items():
+                    slots, term_counts = self._postings.setdefault(term, ([], []))
+                    slots.append(slot)
+                    term_counts.append(count)
+                    self._arrays.pop(term, None)
+                self._doc_freq.update(counts.keys())
+                self._total_length += len(tokens)
+
+            # Postings of this batch now sit at the back, so only older ones are evicted
+            evictable = len(self._slot_of) - len(set(keys))
+            excess = min(len(self._slot_of) - self.max_docs, evictable)
+            for key in list(islice(self._slot_of, max(0, excess))):
+                self._drop(key)
+            if self._removed > len(self._slot_of):
+                self._compact()
+
+    def _drop(self, key):
+        slot = self._slot_of.pop(key)
+        self._keys[slot] = None
+        self._total_length -= self._lengths[slot]
+        self._doc_freq.subtract(self._terms[slot])
+        self._terms[slot] = []
+        self._removed += 1  # its posting-list entries are skipped until the next compaction
+
+    def _compact(self):
+        """Rebuilds the posting lists without removed postings."""
+        live = [slot for slot, key in enumerate(self._keys) if key is not None]
+        new_slot = {old: new for new, old in enumerate(live)}
+        postings = {}
+        for term, (slots, counts) in self._postings.items():
+            kept = [(new_slot[s], c) for s, c in zip(slots, counts) if s in new_slot]
+            if kept:
+                postings[term] = ([s for s, _ in kept], [c for _, c in kept])
+        self._postings = postings
+        self._arrays = {}
+        self._keys = [self._keys[s] for s in live]
+        self._lengths = [self._lengths[s] for s in live]
+        self._terms = [self._terms[s] for s in live]
+        self._slot_of = {key: slot for slot, key in enumerate(self._keys)}
+        self._doc_freq = +self._doc_freq  # drops terms whose count reached 0
+        self._removed = 0
+
+    def _posting_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            slots, counts = self._postings[term]
+            arrays = self._arrays[term] = (np.array(slots, dtype=np.int64), np.array(counts, dtype=np.float64))
+        return arrays
+
+    # -------- Queries --------
+
+    def _idf(self, term):
+        n_docs = len(self._slot_of)
+        df = self._doc_freq.get(term, 0)
+        return np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+    def top_terms(self, text, num_terms=32):
+        """The text's most distinctive indexed terms, by term count x idf."""
+        counts = Counter(self._tokens(text))
+        with self._lock:
+            weighted = [(count * self._idf(term), term) for term, count in counts.items()
+                        if self._doc_freq.get(term, 0) > 0]
+        weighted.sort(reverse=True)
+        return [term for _, term in weighted[:num_terms]]
+
+    def scores(self, terms, keys):
+        """BM25 score of each posting in keys for the query terms (0 for unknown keys)."""
+        with self._lock:
+            n_slots = len(self._keys)
+            if not self._slot_of or not keys:
+                return np.zeros(len(keys))
+            lengths = np.asarray(self._lengths, dtype=np.float64)
+            average = self._total_length / len(self._slot_of) or 1.0
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average)
+            totals = np.zeros(n_slots)
+            for term in dict.fromkeys(terms):
+                if self._doc_freq.get(term, 0) <= 0:
+                    continue
+                slots, counts = self._posting_arrays(term)
+                contribution = self._idf(term) * counts * (BM25_K1 + 1) / (counts + norm[slots])
+                totals += np.bincount(slots, weights=contribution, minlength=n_slots)
+            slots = np.array([self._slot_of.get(key, -1) for key in keys], dtype=np.int64)
+        return np.where(slots >= 0, totals[np.maximum(slots, 0)], 0.0)
+
+    def shortlist(self, texts, keys, k, num_terms=32):
+        """
+        Keys of the k best-scoring postings for each query text (union over
+        texts). Ties and postings without any shared term fill the remaining
+        places, so each text contributes min(k, len(keys)) postings.
+        """
+        if k >= len(keys):
+            return set(keys)
+        keep = set()
+        if k <= 0:
+            return keep
+        for text in texts:
+            scores = self.scores(self.top_terms(text, num_terms), keys)
+            top = np.argpartition(-scores, k - 1)[:k]
+            keep.update(keys[i] for i in top)
+        return keep
@@ -0,0 +1,173 @@
+# matcher/tfidf_corpus.py
+
+import threading
+from collections import Counter, OrderedDict
+from itertools import islice
+
+import numpy as np
+
+MAX_CORPUS_DOCS = 50000  # least recently used postings are dropped beyond this
+
+
+class TfidfCorpus:
+    """
+    Long-lived TF-IDF model over job postings.
+
+    Holds the vocabulary, document frequencies and term counts of every
+    posting it has seen, so postings are tokenized once when added and the
+    corpus is never re-fitted. At query time only the incoming text is
+    tokenized and scored with one sparse mat-vec.
+
+    Weighting matches sklearn's TfidfVectorizer defaults
+    (smooth idf, raw term counts, l2-normalized rows).
+    """
+
+    def __init__(self, stop_words="english", max_docs=MAX_CORPUS_DOCS):
+        self.stop_words = stop_words
+        self._analyzer = None  # sklearn is imported on first use
+        self.max_docs = max_docs
+        self.vocabulary = {}
+        self._doc_freq = np.zeros(1024, dtype=np.float64)
+        self._docs = OrderedDict()  # key -> (term indices, term counts)
+        self._matrix = None  # cached weighted job matrix
+        self._row_of = {}  # key -> row in the cached matrix
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, key):
+        return key in self._docs
+
+    # -------- Corpus updates --------
+
+    def add_many(self, keys, texts):
+        """
+        Adds postings whose key is not in the corpus yet. Postings passed in
+        are never evicted by this call.
+        """
+        with self._lock:
+            changed = False
+            for key, text in zip(keys, texts):
+                if key in self._docs:
+                    self._docs.move_to_end(key)
+                    continue
+                indices, counts, _ = self._count(text, grow=True)
+                self._docs[key] = (indices, counts)
+                self._doc_freq[indices] += 1
+                changed = True
+
+            # Postings of this batch were moved to the back, so only older ones are evicted;
+            # a batch larger than max_docs is kept whole rather than scoring 0 for part of it
+            evictable = len(self._docs) - len(set(keys))
+            for key in list(islice(self._docs, max(0, min(len(self._docs) - self.max_docs, evictable)))):
+                self._drop(key)
+
+            if changed:
+                self._matrix = None
+
+    def remove(self, key):
+        """Removes a posting and its contribution to the document frequencies."""
+        with self._lock:
+            if key in self._docs:
+                self._drop(key)
+                self._matrix = None
+
+    def _drop(self, key):
+        indices, _ = self._docs.pop(key)
+        self._doc_freq[indices] -= 1
+        self._matrix = None
+
+    # -------- Weighting --------
+
+    def _count(self, text, grow):
+        """Tokenizes text; returns (term indices, counts, counts of unknown terms)."""
+        if self._analyzer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+            self._analyzer = CountVectorizer(stop_words=self.stop_words).build_analyzer()
+        term_counts = Counter(self._analyzer(text))
+        indices, counts, unknown = [], [], []
+        for term, count in term_counts.items():
+            index = self.vocabulary.get(term)
+            if index is None:
+                if not grow:
+                    unknown.append(count)
+                    continue
+                index = len(self.vocabulary)
+                self.vocabulary[term] = index
+                if index >= len(self._doc_freq):
+                    self._doc_freq = np.concatenate([self._doc_freq, np.zeros_like(self._doc_freq)])
+            indices.append(index)
+            counts.append(count)
+        return np.array(indices, dtype=np.int64), np.array(counts, dtype=np.float64), unknown
+
+    def _idf(self):
+        n_docs = len(self._docs)
+        return np.log((1 + n_docs) / (1 + self._doc_freq[:len(self.vocabulary)])) + 1
+
+    def _job_matrix(self):
+        """Weighted, l2-normalized job matrix; rebuilt only after the corpus changed."""
+        if self._matrix is None:
+            keys = list(self._docs.keys())
+            rows = list(self._docs.values())
+            indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(indices) for indices, _ in rows])
+            indices = np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, dtype=np.int64)
+            counts = np.concatenate([r[1] for r in rows]) if rows else np.zeros(0)
+            from scipy.sparse import csr_matrix, diags
+            counts_matrix = csr_matrix((counts, indices, indptr), shape=(len(rows), len(self.vocabulary)))
+            from sklearn.preprocessing import normalize
+            self._matrix = normalize(counts_matrix @ diags(self._idf()), norm="l2", copy=False).tocsr()
+            self._row_of = {key: i for i, key in enumerate(keys)}
+        return self._matrix, self._row_of
+
+    def transform(self, texts):
+        """
+        Vectorizes query texts against the fitted vocabulary and IDF.
+        Terms unknown to the corpus still count towards the query norm
+        (with the idf of an unseen term), as they would if the query were
+        part of the fitted corpus.
+        """
+        with self._lock:
+            idf = self._idf()
+            unseen_idf = np.log(1 + len(self._docs)) + 1
+            data, indices, indptr = [], [], [0]
+            for text in texts:
+                term_indices, counts, unknown = self._count(text, grow=False)
+                weights = counts * idf[term_indices]
+                norm = np.sqrt(np.sum(weights ** 2) + np.sum((np.array(unknown) * unseen_idf) ** 2))
+                if norm > 0:
+                    weights = weights / norm
+                data.append(weights)
+                indices.append(term_indices)
+                indptr.append(indptr[-1] + len(term_indices))
+
+            from scipy.sparse import csr_matrix
+            return csr_matrix(
+                (np.concatenate(data) if data else np.zeros(0),
+                 np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64),
+                 np.array(indptr)),
+                shape=(len(texts), len(self.vocabulary)),
+            )
+
+    # -------- Scoring --------
+
+    def similarity(self, text, keys):
+        """Cosine similarity between text and each posting in keys (0 for unknown keys)."""
+        return self.similarity_matrix([text], keys)[0]
+
+    def similarity_matrix(self, texts, keys):
+        """
+        Cosine similarities between several query texts and the postings in keys,
+        as a dense (len(texts), len(keys)) array computed with one sparse product.
+        """
+        queries = self.transform(texts)
+        with self._lock:
+            matrix, row_of = self._job_matrix()
+            scores = np.zeros((len(texts), len(keys)))
+            present = [i for i, key in enumerate(keys) if key in row_of]
+            if present:
+                rows = matrix[[row_of[keys[i]] for i in present]]
+                vocab_size = min(rows.shape[1], queries.shape[1])
+                scores[:, present] = (queries[:, :vocab_size] @ rows[:, :vocab_size].T).toarray()
+        return scores
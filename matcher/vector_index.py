@@ -0,0 +1,203 @@
+# matcher/vector_index.py
+
+import threading
+from collections import OrderedDict
+from itertools import islice
+
+import numpy as np
+
+MAX_INDEX_KEYS = 50000  # least recently used keys are dropped beyond this, like TfidfCorpus
+EXACT_SEARCH_MAX = 5000  # below this many vectors, brute force is as fast as IVF
+DEFAULT_N_PROBE = 8
+ASSIGN_CHUNK_ROWS = 65536  # vectors read from the store at a time when bucketing
+
+
+def _normalize(vectors):
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return vectors / norms
+
+
+class ExactIndex:
+    """
+    Brute-force cosine index over dense job embeddings.
+
+    The index only holds keys: vectors stay in `store` (the memory-mapped
+    EmbeddingFile), which scores them in chunks via score(queries, keys) and
+    reads them via vectors(keys). No float32 copy of the corpus is kept in
+    the process heap, and at most `max_size` keys are indexed.
+    """
+
+    def __init__(self, store, max_size=MAX_INDEX_KEYS):
+        self.store = store
+        self.max_size = max_size
+        self._keys = OrderedDict()  # key -> None, least recently used first
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def add(self, keys):
+        """
+        Adds keys that have a vector in the store and marks them as recently
+        used. Least recently used keys beyond max_size are dropped, but never
+        keys passed in this call, even if the batch alone is larger.
+        """
+        with self._lock:
+            batch, new = set(), []
+            for key in keys:
+                if key in self._keys:
+                    self._keys.move_to_end(key)
+                elif key in self.store:
+                    self._keys[key] = None
+                    new.append(key)
+                else:
+                    continue
+                batch.add(key)
+
+            # Keys of this batch now sit at the back, so only older ones are evicted
+            evictable = len(self._keys) - len(batch)
+            for key in list(islice(self._keys, max(0, min(len(self._keys) - self.max_size, evictable)))):
+                self.remove(key)
+            if new:
+                self._on_insert(new)
+
+    def remove(self, key):
+        with self._lock:
+            if self._keys.pop(key, 0) is None:
+                self._on_remove(key)
+
+    def _on_insert(self, keys):
+        pass
+
+    def _on_remove(self, key):
+        pass
+
+    def _candidate_keys(self, query, allowed, k):
+        if allowed is not None:
+            return [key for key in allowed if key in self._keys]
+        return list(self._keys)
+
+    def search(self, query, k=10, allowed=None):
+        """
+        Returns (keys, scores) of the k vectors most similar to query, best first.
+        `allowed` optionally restricts the search to a set of keys.
+        """
+        query = _normalize(query)[0]
+        with self._lock:
+            candidates = self._candidate_keys(query, allowed, k)
+        if not candidates:
+            return [], np.zeros(0, dtype=np.float32)
+        scores = self.store.score(query, candidates)[0]
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(candidates) else np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [candidates[i] for i in top], scores[top]
+
+
+class IVFIndex(ExactIndex):
+    """
+    Inverted-file index: vectors are bucketed by their nearest k-means centroid
+    and a query only scans the `n_probe` closest buckets.
+
+    `n_probe` is the recall/latency knob: higher probes more buckets (better
+    recall, slower), `n_probe == n_lists` is exact search. Until enough vectors
+    have been added to train the centroids, the index searches exhaustively.
+    The centroids are retrained every `train_size` inserted keys, so buckets
+    follow the corpus as it grows and as old postings are evicted.
+    """
+
+    def __init__(self, store, n_lists=256, n_probe=DEFAULT_N_PROBE, train_size=None, max_size=MAX_INDEX_KEYS):
+        super().__init__(store, max_size)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_size = train_size or n_lists * 40
+        self._centroids = None
+        self._lists = None  # bucket -> set of keys
+        self._list_of = {}  # key -> bucket
+        self._inserted_since_training = 0
+
+    def _on_insert(self, keys):
+        self._inserted_since_training += len(keys)
+        if self._inserted_since_training >= self.train_size and self.train():
+            return
+        if self._centroids is not None:
+            self._assign(keys)
+
+    def _on_remove(self, key):
+        bucket = self._list_of.pop(key, None)
+        if bucket is not None:
+            self._lists[bucket].discard(key)
+
+    def _assign(self, keys):
+        """Buckets keys by nearest centroid, reading their vectors from the store in chunks."""
+        for start in range(0, len(keys), ASSIGN_CHUNK_ROWS):
+            chunk = keys[start:start + ASSIGN_CHUNK_ROWS]
+            buckets = np.argmax(self.store.vectors(chunk) @ self._centroids.T, axis=1)
+            for key, bucket in zip(chunk, buckets):
+                old = self._list_of.get(key)
+                if old is not None:
+                    self._lists[old].discard(key)
+                self._lists[bucket].add(key)
+                self._list_of[key] = int(bucket)
+
+    def train(self, iterations=10, seed=0):
+        """
+        (Re)computes centroids with spherical k-means and re-buckets all vectors.
+        Returns False if there are fewer vectors than lists.
+        """
+        with self._lock:
+            keys = list(self._keys)
+            if len(keys) < self.n_lists:
+                return False
+            rng = np.random.default_rng(seed)
+            sample = rng.choice(len(keys), size=min(len(keys), self.train_size), replace=False)
+            data = _normalize(self.store.vectors([keys[i] for i in np.sort(sample)]))
+            centroids = data[rng.choice(len(data), size=self.n_lists, replace=False)].copy()
+
+            for _ in range(iterations):
+                assignment = np.argmax(data @ centroids.T, axis=1)
+                for bucket in range(self.n_lists):
+                    members = data[assignment == bucket]
+                    if len(members):
+                        centroids[bucket] = members.mean(axis=0)
+                centroids = _normalize(centroids)
+
+            self._centroids = centroids
+            self._lists = [set() for _ in range(self.n_lists)]
+            self._list_of = {}
+            self._assign(keys)
+            self._inserted_since_training = 0
+            return True
+
+    def _candidate_keys(self, query, allowed, k):
+        exhaustive = self._centroids is None or self.n_probe >= self.n_lists
+        # A small allowed set is cheaper to scan exactly than to probe for
+        if exhaustive or (allowed is not None and len(allowed) <= EXACT_SEARCH_MAX):
+            return super()._candidate_keys(query, allowed, k)
+
+        if allowed is not None:
+            allowed = {key for key in allowed if key in self._keys}
+            k = min(k, len(allowed))
+
+        # Probe at least n_probe buckets, then keep going in centroid order until
+        # k candidates survive the allowed filter
+        order = np.argsort(-(self._centroids @ query))
+        candidates = set()
+        for probed, bucket in enumerate(order, start=1):
+            bucket_keys = self._lists[bucket]
+            candidates |= bucket_keys if allowed is None else bucket_keys & allowed
+            if probed >= self.n_probe and len(candidates) >= k:
+                break
+        return sorted(candidates)
+
+def build_index(store, expected_size=0, n_probe=DEFAULT_N_PROBE):
+    """Exact search for small corpora, IVF for large ones, over vectors in `store`."""
+    if expected_size < EXACT_SEARCH_MAX:
+        return ExactIndex(store)
+    n_lists = int(np.clip(np.sqrt(expected_size), 64, 4096))
+    return IVFIndex(store, n_lists=n_lists, n_probe=n_probe)
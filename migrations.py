@@ -0,0 +1,56 @@
+# migrations.py
+#
+# Schema changes for existing databases. db.create_all() only creates missing
+# tables, so anything added to an existing table (indexes, columns) goes here.
+# The applied version is tracked in SQLite's PRAGMA user_version.
+# A step is either SQL or a callable taking the connection.
+
+
+def add_column(table, column, ddl):
+    """ALTER TABLE ADD COLUMN, skipped when create_all already made the column."""
+    def _step(conn):
+        columns = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+    return _step
+
+
+MIGRATIONS = [
+    (1, [
+        "CREATE INDEX IF NOT EXISTS ix_resume_user_id ON resume (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_monitoring_rule_user_created ON monitoring_rule (user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_watchlist_match_found_at ON watchlist_match (found_at)",
+        "CREATE INDEX IF NOT EXISTS ix_watchlist_match_rule_found ON watchlist_match (rule_id, found_at)",
+        "CREATE INDEX IF NOT EXISTS ix_watchlist_match_rule_title_company "
+        "ON watchlist_match (rule_id, job_title, company)",
+    ]),
+    (2, [
+        # watchlist_feed itself is created by create_all; backfill it from existing matches
+        "INSERT OR IGNORE INTO watchlist_feed "
+        "(id, user_id, rule_id, rule_job_title, job_title, company, location, match_score, link, found_at) "
+        "SELECT m.id, r.user_id, m.rule_id, r.job_title, m.job_title, m.company, m.location, m.match_score, "
+        "m.link, COALESCE(m.found_at, CURRENT_TIMESTAMP) "
+        "FROM watchlist_match m JOIN monitoring_rule r ON r.id = m.rule_id",
+    ]),
+    (3, [
+        # Admins can ask for the next monitor cycle of a rule to be profiled
+        add_column("monitoring_rule", "profile_next_run", "BOOLEAN NOT NULL DEFAULT 0"),
+    ]),
+]
+
+
+def run_migrations(db):
+    """Creates missing tables, then applies every migration newer than the database."""
+    db.create_all()
+    with db.engine.begin() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        for target, statements in MIGRATIONS:
+            if target <= version:
+                continue
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.exec_driver_sql(statement)
+            conn.exec_driver_sql(f"PRAGMA user_version = {target}")
+            print(f"✅ Database migrated to version {target}")
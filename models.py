@@ -1,4 +1,8 @@
+import sqlite3
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from flask_bcrypt import Bcrypt
 from flask_login import UserMixin  # 👈 Add this
 from datetime import datetime
@@ -6,6 +10,19 @@ from datetime import datetime
 db = SQLAlchemy()
 bcrypt = Bcrypt()
 
+SQLITE_BUSY_TIMEOUT_MS = 30000
+
+
+@event.listens_for(Engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    """WAL lets monitor writes proceed without blocking dashboard reads."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
 class User(db.Model, UserMixin):
     __tablename__ = "user"  # ✅ Add this
 
@@ -28,7 +45,7 @@ class Resume(db.Model):
     filename = db.Column(db.String(120), nullable=False)
     filepath = db.Column(db.String(200), nullable=False)
     upload_date = db.Column(db.DateTime, default=datetime.utcnow)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
 
 
 class MonitoringRule(db.Model):
@@ -39,10 +56,16 @@ class MonitoringRule(db.Model):
     resume_id = db.Column(db.Integer, db.ForeignKey("resume.id"), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    profile_next_run = db.Column(db.Boolean, nullable=False, default=False, server_default="0")
 
     resume = db.relationship("Resume", backref="monitoring_rules")
     user = db.relationship("User", backref="monitoring_rules")
 
+    __table_args__ = (
+        # /monitor lists a user's rules newest first
+        db.Index("ix_monitoring_rule_user_created", "user_id", "created_at"),
+    )
+
 
 class WatchlistMatch(db.Model):
     __tablename__ = "watchlist_match"  # ✅ Recommended but optional
@@ -54,7 +77,43 @@ class WatchlistMatch(db.Model):
     description = db.Column(db.Text)
     match_score = db.Column(db.Float)
     link = db.Column(db.String(500))
-    found_at = db.Column(db.DateTime, default=datetime.utcnow)
+    found_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
     rule_id = db.Column(db.Integer, db.ForeignKey("monitoring_rule.id"), nullable=False)
     monitoring_rule = db.relationship("MonitoringRule", backref="matches")
+
+    __table_args__ = (
+        # Per-rule de-duplication lookup in the monitor
+        db.Index("ix_watchlist_match_rule_title_company", "rule_id", "job_title", "company"),
+        # /watchlist joins on rule_id and orders by found_at
+        db.Index("ix_watchlist_match_rule_found", "rule_id", "found_at"),
+    )
+
+    @property
+    def rule_job_title(self):
+        return self.monitoring_rule.job_title
+
+
+class WatchlistFeed(db.Model):
+    """
+    Denormalized per-user copy of WatchlistMatch, written by the monitor
+    alongside each match, so a watchlist page is one range scan on
+    (user_id, found_at, id) with no join. `id` is the WatchlistMatch id.
+    """
+    __tablename__ = "watchlist_feed"
+
+    id = db.Column(db.Integer, db.ForeignKey("watchlist_match.id"), primary_key=True, autoincrement=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    rule_id = db.Column(db.Integer, db.ForeignKey("monitoring_rule.id"), nullable=False)
+    rule_job_title = db.Column(db.String(100))
+    job_title = db.Column(db.String(200))
+    company = db.Column(db.String(200))
+    location = db.Column(db.String(200))
+    match_score = db.Column(db.Float)
+    link = db.Column(db.String(500))
+    found_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_watchlist_feed_user_found", "user_id", "found_at", "id"),
+        db.Index("ix_watchlist_feed_rule_id", "rule_id"),
+    )
@@ -1,46 +1,148 @@
 # monitoring/background_job.py
 
+import os
 import time
-from threading import Thread
+
+from monitoring.scheduler import MonitorScheduler
+from telemetry.metrics import finish_trace, registry, start_trace
+from telemetry.profiler import maybe_profiled
 
 CHECK_INTERVAL = 600  # 10 minutes
+MONITOR_WORKERS = int(os.getenv("MONITOR_WORKERS", "4"))
+MONITOR_JITTER = 0.1  # +/- 10% of CHECK_INTERVAL
+
+# One monitor cycle = one check of a job title for every rule that shares it
+cycle_seconds = registry.histogram("monitor_cycle_duration_seconds", "Duration of one monitor cycle")
+rules_per_cycle = registry.histogram(
+    "monitor_rules_per_cycle", "Rules processed in one monitor cycle", buckets=(1, 2, 5, 10, 25, 50, 100, 250)
+)
+rules_processed = registry.counter("monitor_rules_processed_total", "Monitoring rules checked")
+new_matches_found = registry.counter("monitor_new_matches_total", "New watchlist matches stored")
+
+def monitor_jobs_loop(app, db, MonitoringRule, WatchlistMatch, scrape_jobs_func, extract_text_func, match_func,
+                      match_many_func=None, WatchlistFeed=None):
+    profile_requested = set()  # titles with a rule flagged to profile its next run
+
+    def _load_groups():
+        # Rules that share a job title are checked together: one scrape, one batched match
+        with app.app_context():
+            groups = {}
+            flagged = set()
+            rows = db.session.query(MonitoringRule.id, MonitoringRule.job_title, MonitoringRule.profile_next_run).all()
+            for rule_id, job_title, profile_next_run in rows:
+                groups.setdefault(job_title, []).append(rule_id)
+                if profile_next_run:
+                    flagged.add(job_title)
+            profile_requested.clear()
+            profile_requested.update(flagged)
+            return {job_title: tuple(rule_ids) for job_title, rule_ids in groups.items()}
+
+    def _check_title(job_title, rule_ids):
+        profile = job_title in profile_requested
+        start_trace(kind="monitor", job_title=job_title)
+        start = time.perf_counter()
+        try:
+            with maybe_profiled(profile, "monitor", job_title):
+                new_count = _check_title_rules(job_title, rule_ids)
+            if profile:
+                _clear_profile_flag(rule_ids)
+                profile_requested.discard(job_title)
+        finally:
+            cycle_seconds.observe(time.perf_counter() - start)
+            finish_trace(rules=len(rule_ids))
+        rules_per_cycle.observe(len(rule_ids))
+        rules_processed.inc(len(rule_ids))
+        new_matches_found.inc(new_count)
+
+    def _clear_profile_flag(rule_ids):
+        # One capture per request: the flag is reset once the cycle has been profiled
+        with app.app_context():
+            MonitoringRule.query.filter(MonitoringRule.id.in_(rule_ids)).update(
+                {MonitoringRule.profile_next_run: False}, synchronize_session=False
+            )
+            db.session.commit()
 
-def monitor_jobs_loop(app, db, MonitoringRule, WatchlistMatch, scrape_jobs_func, extract_text_func, match_func):
-    def _run_loop():
+    def _check_title_rules(job_title, rule_ids):
+        """Scrapes and matches one title for its rules; returns the number of new matches stored."""
         with app.app_context():
-            print("📡 Real-time job monitoring started...")
-            while True:
-                rules = MonitoringRule.query.all()
-                for rule in rules:
-                    print(f"🔄 Checking jobs for rule: {rule.job_title} (User ID: {rule.user_id})")
-
-                    resume_text = extract_text_func(rule.resume.filepath)
-                    job_df = scrape_jobs_func(rule.job_title, pages=1)
-                    top_matches = match_func(resume_text, jobs_df=job_df, top_n=10)
-
-                    for _, row in top_matches.iterrows():
-                        already_exists = WatchlistMatch.query.filter_by(
-                            rule_id=rule.id,
-                            job_title=row["title"],
-                            company=row["company"]
-                        ).first()
-
-                        if not already_exists:
-                            match = WatchlistMatch(
-                                rule_id=rule.id,
-                                job_title=row["title"],
-                                company=row["company"],
-                                location=row["location"],
-                                description=row["description"],
-                                match_score=row["match_score"],
-                                link=row["link"]
-                            )
-                            db.session.add(match)
-                            db.session.commit()
-                            print(f"✅ New match found: {row['title']} - {row['company']}")
-
-                time.sleep(CHECK_INTERVAL)
-
-    # Run in background thread
-    thread = Thread(target=_run_loop, daemon=True)
-    thread.start()
+            rules = MonitoringRule.query.filter(MonitoringRule.id.in_(rule_ids)).all()
+            if not rules:
+                return 0
+            print(f"🔄 Checking jobs for: {job_title} ({len(rules)} rules)")
+
+            job_df = scrape_jobs_func(job_title, pages=1)
+            if job_df.empty:
+                return 0
+
+            resume_texts = [extract_text_func(rule.resume.filepath) for rule in rules]
+            if match_many_func:
+                # One resumes x jobs product for every rule sharing this title
+                top_matches_list = match_many_func(resume_texts, jobs_df=job_df, top_n=10)
+            else:
+                top_matches_list = [match_func(text, jobs_df=job_df, top_n=10) for text in resume_texts]
+
+            # Fetch every existing (rule, title, company) key for these rules in one query
+            existing = set(
+                db.session.query(WatchlistMatch.rule_id, WatchlistMatch.job_title, WatchlistMatch.company)
+                .filter(WatchlistMatch.rule_id.in_([rule.id for rule in rules]))
+                .all()
+            )
+
+            new_matches = []
+            for rule, top_matches in zip(rules, top_matches_list):
+                for row in top_matches.to_dict(orient="records"):
+                    key = (rule.id, row["title"], row["company"])
+                    if key in existing:
+                        continue
+                    existing.add(key)
+                    new_matches.append({
+                        "rule_id": rule.id,
+                        "job_title": row["title"],
+                        "company": row["company"],
+                        "location": row["location"],
+                        "description": row["description"],
+                        "match_score": float(row["match_score"]),
+                        "link": row["link"]
+                    })
+
+            if new_matches:
+                # One batched insert and one commit for the whole group
+                result = db.session.execute(
+                    WatchlistMatch.__table__.insert().returning(
+                        WatchlistMatch.id, WatchlistMatch.rule_id, WatchlistMatch.found_at,
+                        sort_by_parameter_order=True
+                    ),
+                    new_matches
+                )
+                if WatchlistFeed is not None:
+                    rules_by_id = {rule.id: rule for rule in rules}
+                    feed_rows = []
+                    for (match_id, rule_id, found_at), match in zip(result.all(), new_matches):
+                        rule = rules_by_id[rule_id]
+                        feed_rows.append({
+                            "id": match_id,
+                            "user_id": rule.user_id,
+                            "rule_id": rule_id,
+                            "rule_job_title": rule.job_title,
+                            "job_title": match["job_title"],
+                            "company": match["company"],
+                            "location": match["location"],
+                            "match_score": match["match_score"],
+                            "link": match["link"],
+                            "found_at": found_at
+                        })
+                    db.session.execute(WatchlistFeed.__table__.insert(), feed_rows)
+                db.session.commit()
+                print(f"✅ {len(new_matches)} new matches for: {job_title}")
+            return len(new_matches)
+
+    print("📡 Real-time job monitoring started...")
+    scheduler = MonitorScheduler(
+        load_groups=_load_groups,
+        run_group=_check_title,
+        interval=CHECK_INTERVAL,
+        jitter=MONITOR_JITTER,
+        max_workers=MONITOR_WORKERS
+    )
+    scheduler.start()
+    return scheduler
@@ -0,0 +1,110 @@
+# monitoring/leader.py
+
+import atexit
+import os
+import socket
+import threading
+import time
+
+from sqlalchemy import text
+
+LEASE_TTL = 60  # seconds a leader holds the lease without renewing
+RENEW_INTERVAL = 20
+
+
+class LeaderLease:
+    """
+    Lease-based leader election on the app's database.
+
+    One row per lease name holds the current owner and an expiry time.
+    A process becomes leader by inserting the row or taking it over once it
+    has expired, and stays leader by renewing before the expiry. If the
+    leader dies, another process takes over after at most `ttl` seconds.
+    """
+
+    def __init__(self, app, db, name="monitor", ttl=LEASE_TTL):
+        self.app = app
+        self.db = db
+        self.name = name
+        self.ttl = ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        with app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(text("""
+                    CREATE TABLE IF NOT EXISTS monitor_lease (
+                        name VARCHAR(50) PRIMARY KEY,
+                        owner VARCHAR(200) NOT NULL,
+                        expires_at FLOAT NOT NULL
+                    )
+                """))
+
+    def try_acquire(self):
+        """Acquires or renews the lease; returns True if this process holds it."""
+        now = time.time()
+        params = {"name": self.name, "owner": self.owner, "expires_at": now + self.ttl, "now": now}
+        with self.app.app_context():
+            with self.db.engine.begin() as conn:
+                conn.execute(text(
+                    "INSERT OR IGNORE INTO monitor_lease (name, owner, expires_at) "
+                    "VALUES (:name, :owner, :expires_at)"
+                ), params)
+                result = conn.execute(text(
+                    "UPDATE monitor_lease SET owner = :owner, expires_at = :expires_at "
+                    "WHERE name = :name AND (owner = :owner OR expires_at < :now)"
+                ), params)
+                return result.rowcount == 1
+
+    def release(self):
+        with self.app.app_context():
+            with self.db.engine.begin() as conn:
+                conn.execute(text(
+                    "DELETE FROM monitor_lease WHERE name = :name AND owner = :owner"
+                ), {"name": self.name, "owner": self.owner})
+
+
+def run_as_leader(lease, on_elected, on_demoted=None, block=False, renew_interval=RENEW_INTERVAL):
+    """
+    Keeps trying to hold `lease`. Calls on_elected() when this process becomes
+    leader and on_demoted() if it loses the lease. A failed check counts as
+    losing the lease only once the last renewed lease has expired. Runs in a
+    daemon thread unless `block` is True.
+    """
+    def _loop():
+        leading = False
+        held_until = 0.0  # expiry of the lease as of our last successful renewal
+        while True:
+            checked_at = time.time()
+            try:
+                holds = lease.try_acquire()
+                if holds:
+                    held_until = checked_at + lease.ttl
+            except Exception as e:
+                # Unknown (e.g. "database is locked"): nobody else can take the lease
+                # before it expires, so a leader keeps leading until then
+                holds = leading and time.time() < held_until
+                print(f"⚠️ Leader lease check failed: {e}" + (" (keeping the lease until it expires)" if holds else ""))
+
+            if holds and not leading:
+                print(f"👑 {lease.owner} is now the {lease.name} leader")
+                leading = True
+                on_elected()
+            elif leading and not holds:
+                print(f"⚠️ {lease.owner} lost the {lease.name} lease")
+                leading = False
+                if on_demoted:
+                    on_demoted()
+
+            time.sleep(renew_interval)
+
+    atexit.register(lambda: _safe_release(lease))
+    if block:
+        _loop()
+    else:
+        threading.Thread(target=_loop, name=f"{lease.name}-leader", daemon=True).start()
+
+
+def _safe_release(lease):
+    try:
+        lease.release()
+    except Exception:
+        pass
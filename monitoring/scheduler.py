@@ -0,0 +1,135 @@
+# monitoring/scheduler.py
+
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MonitorScheduler:
+    """
+    Runs monitoring work on a bounded worker pool, each group on its own cadence.
+
+    - load_groups() returns {key: payload}; here a key is a job title and the
+      payload the ids of the rules that share it, so each distinct query is
+      scraped once per run. Groups are reloaded every `refresh_interval`.
+    - run_group(key, payload) does the work for one group on a worker thread.
+    - Every group has its own next-run time in a priority queue, spread by
+      +/- `jitter` (a fraction of the interval) so groups do not all fire together.
+    - Backpressure: when `max_pending` groups are already queued or running,
+      due groups wait instead of piling up in the pool.
+    - Overruns: a group that is still running when it is due again is skipped
+      for that slot, and runs longer than the interval are reported.
+    """
+
+    def __init__(self, load_groups, run_group, interval=600, jitter=0.1, max_workers=4, max_pending=None,
+                 refresh_interval=60, name="monitor"):
+        self.load_groups = load_groups
+        self.run_group = run_group
+        self.interval = interval
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * 2
+        self.refresh_interval = refresh_interval
+        self.name = name
+
+        self._heap = []  # (next_run, key)
+        self._payloads = {}
+        self._running = set()
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.stats = {"runs": 0, "failures": 0, "overruns": 0, "skipped": 0, "deferred": 0, "last_duration": 0.0}
+
+    def _jittered(self, base):
+        return base + self.interval * random.uniform(-self.jitter, self.jitter)
+
+    def refresh(self):
+        """Syncs the queue with the current groups: new ones are scheduled soon, removed ones dropped."""
+        groups = self.load_groups()
+        now = time.time()
+        with self._cond:
+            for key, payload in groups.items():
+                # A group removed and re-added while it runs is rescheduled by that run when it ends
+                if key not in self._payloads and key not in self._running:
+                    # Spread first runs over a short window instead of firing all at once
+                    heapq.heappush(self._heap, (now + random.uniform(0, self.interval * self.jitter), key))
+                self._payloads[key] = payload
+            for key in list(self._payloads):
+                if key not in groups:
+                    del self._payloads[key]
+            self._heap = [(t, key) for t, key in self._heap if key in self._payloads]
+            heapq.heapify(self._heap)
+            self._cond.notify()
+
+    def _execute(self, key, payload, scheduled_at):
+        start = time.time()
+        failed = False
+        try:
+            self.run_group(key, payload)
+        except Exception as e:
+            failed = True
+            print(f"⚠️ Monitoring failed for '{key}': {e}")
+        finally:
+            duration = time.time() - start
+            with self._cond:
+                self.stats["failures" if failed else "runs"] += 1
+                self.stats["last_duration"] = duration
+                if duration > self.interval:
+                    self.stats["overruns"] += 1
+                    print(f"⚠️ Overrun: '{key}' took {duration:.0f}s (interval {self.interval}s)")
+                self._running.discard(key)
+                self._pending -= 1
+                if key in self._payloads:
+                    next_run = max(scheduled_at + self.interval, time.time())
+                    heapq.heappush(self._heap, (self._jittered(next_run), key))
+                self._cond.notify()
+
+    def _dispatch_due(self):
+        """Submits due groups while the pool has room; returns seconds until the next due group."""
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            if self._pending >= self.max_pending:
+                self.stats["deferred"] += 1
+                return 1.0
+
+            scheduled_at, key = heapq.heappop(self._heap)
+            if key in self._running:
+                # Previous run is still going; it reschedules itself when it finishes
+                self.stats["skipped"] += 1
+                print(f"⚠️ Overrun: '{key}' is still running, skipping this slot")
+                continue
+
+            self._running.add(key)
+            self._pending += 1
+            self._executor.submit(self._execute, key, self._payloads[key], scheduled_at)
+
+        return self._heap[0][0] - now if self._heap else self.refresh_interval
+
+    def run_forever(self):
+        next_refresh = 0
+        while not self._stopped:
+            if time.time() >= next_refresh:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Could not load monitoring rules: {e}")
+                next_refresh = time.time() + self.refresh_interval
+
+            with self._cond:
+                wait = self._dispatch_due()
+                self._cond.wait(timeout=max(0.05, min(wait, next_refresh - time.time())))
+
+    def start(self):
+        thread = threading.Thread(target=self.run_forever, name=f"{self.name}-scheduler", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self, wait=False):
+        """Stops scheduling and drops queued groups; with `wait`, blocks until running groups finish."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
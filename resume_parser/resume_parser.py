@@ -0,0 +1,58 @@
+# resume_parser/resume_parser.py
+
+import os
+
+import fitz  # PyMuPDF
+
+from telemetry.metrics import timed_function
+
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "40"))
+MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", str(10 * 1024 * 1024)))  # 10 MB
+
+
+class PDFTooLargeError(ValueError):
+    """Raised when a PDF exceeds MAX_PDF_BYTES."""
+
+
+def _check_size(pdf_path, max_bytes):
+    size = os.path.getsize(pdf_path)
+    if max_bytes and size > max_bytes:
+        raise PDFTooLargeError(f"{os.path.basename(pdf_path)} is {size} bytes (limit {max_bytes})")
+
+
+def _warn_truncated(pdf_path, max_pages, page_count):
+    print(f"⚠️ {os.path.basename(pdf_path)}: only the first {max_pages} of {page_count} pages read")
+
+
+def iter_pdf_pages(pdf_path, max_pages=MAX_PDF_PAGES, max_bytes=MAX_PDF_BYTES):
+    """Yields the text of each page lazily, stopping after max_pages."""
+    _check_size(pdf_path, max_bytes)
+    with fitz.open(pdf_path) as doc:
+        for number, page in enumerate(doc):
+            if max_pages and number >= max_pages:
+                _warn_truncated(pdf_path, max_pages, doc.page_count)
+                break
+            yield page.get_text()
+
+
+@timed_function("pdf_extract")
+def extract_text_from_pdf(pdf_path, max_pages=MAX_PDF_PAGES, max_bytes=MAX_PDF_BYTES, max_chars=None):
+    """
+    Extracts text from a PDF file, joining the pages once.
+
+    - max_pages / max_bytes cap the work done on oversized uploads
+      (pages beyond max_pages are skipped; files over max_bytes raise PDFTooLargeError).
+    - max_chars stops reading pages as soon as that many characters are collected.
+    - Pages are read in-process: within the page cap a process pool costs more
+      to start and feed than it saves.
+    """
+    if max_chars:
+        parts, collected = [], 0
+        for page_text in iter_pdf_pages(pdf_path, max_pages, max_bytes):
+            parts.append(page_text)
+            collected += len(page_text)
+            if collected >= max_chars:
+                break
+        return "".join(parts)[:max_chars]
+
+    return "".join(iter_pdf_pages(pdf_path, max_pages, max_bytes))
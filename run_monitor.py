@@ -0,0 +1,14 @@
+# run_monitor.py
+#
+# Standalone job monitor. Run one (or more, for failover) next to the web
+# workers:
+#
+#     python run_monitor.py
+#
+# Only the process holding the "monitor" lease in the database does any work.
+
+from app import app, start_monitor
+
+if __name__ == "__main__":
+    print("📡 Starting standalone monitor...")
+    start_monitor(block=True)
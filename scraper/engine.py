@@ -0,0 +1,277 @@
+# scraper/engine.py
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup, Comment, NavigableString
+
+from telemetry.metrics import timed
+
+ROZEE_BASE_URL = "https://www.rozee.pk/"
+ROZEE_SEARCH_URL = ROZEE_BASE_URL + "job/jsearch/q/{query}/pn/{page}"
+JOB_COLUMNS = ["title", "company", "location", "description", "link"]
+PAGE_TIMEOUT = 15  # seconds to wait for a page to become ready
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "footer", "form", "h1", "h2",
+    "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+SKIPPED_TAGS = {"script", "style", "noscript", "template"}
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+}
+
+
+# -------- Parsing --------
+
+def parse_job_card(lines, link=""):
+    """Builds a job dict from the text lines of one `div.job` card, or None if incomplete."""
+    lines = [line.strip() for line in lines if line and line.strip()]
+    if len(lines) < 3:
+        return None
+
+    title = lines[0]
+    company_and_location = lines[1]
+    description = lines[2]
+
+    if "," in company_and_location:
+        company, location = company_and_location.split(",", 1)
+    else:
+        company, location = company_and_location, "N/A"
+
+    return {
+        "title": title.strip(),
+        "company": company.strip(),
+        "location": location.strip(),
+        "description": description.strip(),
+        "link": (link or "").strip()
+    }
+
+
+def rendered_lines(element):
+    """
+    The element's text split into lines the way a browser renders it (what
+    Selenium's `.text` returns): block elements and <br> start a new line,
+    inline elements such as the company and city anchors stay on one line.
+    """
+    lines, current = [], []
+
+    def flush():
+        line = " ".join("".join(current).split())
+        if line:
+            lines.append(line)
+        current.clear()
+
+    def walk(node):
+        for child in node.children:
+            if isinstance(child, Comment):
+                continue
+            if isinstance(child, NavigableString):
+                current.append(str(child))
+            elif child.name in SKIPPED_TAGS:
+                continue
+            elif child.name in BLOCK_TAGS:
+                flush()
+                walk(child)
+                flush()
+            else:
+                walk(child)
+
+    walk(element)
+    flush()
+    return lines
+
+
+def parse_jobs_html(html, page_url=ROZEE_BASE_URL):
+    """
+    Parses job cards out of a search results page (live or a saved fixture).
+    Links are resolved against page_url, since rozee serves them
+    protocol-relative ("//www.rozee.pk/...").
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    jobs = []
+    for card in soup.select("div.job"):
+        anchor = card.find("a", href=True)
+        job = parse_job_card(rendered_lines(card), urljoin(page_url, anchor["href"]) if anchor else "")
+        if job:
+            jobs.append(job)
+    return jobs
+
+
+def page_is_ready(html):
+    """True once the results have replaced the loading skeleton cards."""
+    return bool(parse_jobs_html(html))
+
+
+# -------- Browser pool --------
+
+class BrowserPool:
+    """
+    Keeps up to `size` headless Chrome sessions warm and hands them out to
+    fetches. The driver binary is resolved once per pool, not per scrape.
+    """
+
+    def __init__(self, size=2):
+        self.size = size
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._service = None
+
+    def _new_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        if self._service is None:
+            self._service = ChromeDriverManager().install()
+
+        options = Options()
+        options.add_argument("--start-maximized")
+        options.add_argument("--headless")
+        return webdriver.Chrome(service=Service(self._service), options=options)
+
+    @contextmanager
+    def session(self):
+        driver = None
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    driver = self._new_driver()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                driver = self._idle.get()
+
+        healthy = True
+        try:
+            yield driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self._idle.put(driver)
+            else:
+                # A failed session may be wedged; replace it on next use
+                with self._lock:
+                    self._created -= 1
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+    def fetch(self, url, timeout=PAGE_TIMEOUT):
+        """Loads url and waits until job cards are rendered (or timeout), then returns the HTML."""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.session() as driver:
+            driver.get(url)
+            try:
+                WebDriverWait(driver, timeout).until(lambda d: page_is_ready(d.page_source))
+            except TimeoutException:
+                print(f"⚠️ Timed out waiting for job cards: {url}")
+            return driver.page_source
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._created -= 1
+
+
+# -------- Engine --------
+
+class ScraperEngine:
+    """
+    Fetches result pages concurrently. Each page is first tried with a plain
+    HTTP request parsed by BeautifulSoup; pages that come back without
+    rendered job cards are loaded through the warm browser pool.
+
+    `fetcher(url) -> html` can be passed to replace the network entirely,
+    e.g. to read saved HTML fixtures.
+    """
+
+    def __init__(self, fetcher=None, use_http=True, use_browser=True, browser_pool_size=2,
+                 max_workers=4, timeout=PAGE_TIMEOUT):
+        self.fetcher = fetcher
+        self.use_http = use_http
+        self.use_browser = use_browser
+        self.timeout = timeout
+        self.browsers = BrowserPool(browser_pool_size) if use_browser and fetcher is None else None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scraper")
+        self._http = threading.local()
+
+    def _session(self):
+        session = getattr(self._http, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HTTP_HEADERS)
+            self._http.session = session
+        return session
+
+    def fetch_page(self, query, page):
+        """Returns the job dicts found on one results page."""
+        url = ROZEE_SEARCH_URL.format(query=query, page=page)
+
+        if self.fetcher is not None:
+            return parse_jobs_html(self.fetcher(url), url)
+
+        if self.use_http:
+            try:
+                with timed("scrape_http"):
+                    response = self._session().get(url, timeout=self.timeout)
+                    response.raise_for_status()
+                    jobs = parse_jobs_html(response.text, response.url)
+                if jobs:
+                    print(f"✅ Found {len(jobs)} jobs on page {page} (http)")
+                    return jobs
+            except requests.RequestException as e:
+                print(f"⚠️ HTTP fetch failed for {url}: {e}")
+
+        if self.browsers is not None:
+            with timed("scrape_browser"):
+                jobs = parse_jobs_html(self.browsers.fetch(url, self.timeout), url)
+            print(f"✅ Found {len(jobs)} jobs on page {page} (browser)")
+            return jobs
+
+        return []
+
+    def scrape(self, query, pages=1):
+        """Fetches pages 1..pages of one query concurrently; returns a DataFrame."""
+        import pandas as pd
+
+        with timed("scrape"):
+            futures = [self._executor.submit(self.fetch_page, query, page) for page in range(1, pages + 1)]
+            job_list = []
+            for future in futures:
+                try:
+                    job_list.extend(future.result())
+                except Exception as e:
+                    print("⚠️ Error fetching page:", e)
+        return pd.DataFrame(job_list, columns=JOB_COLUMNS)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        if self.browsers is not None:
+            self.browsers.close()
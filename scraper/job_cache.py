@@ -0,0 +1,184 @@
+# scraper/job_cache.py
+
+import os
+import pickle
+import threading
+import time
+
+from sqlite_store import SQLiteStore
+
+JOB_CACHE_PATH = os.getenv("JOB_CACHE_PATH", "data/job_cache.db")
+JOB_CACHE_TTL = int(os.getenv("JOB_CACHE_TTL", "1800"))  # 30 min
+JOB_CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "200"))
+SCRAPE_LEASE_SECONDS = 120  # a crashed scraper's lock is ignored after this
+
+
+class JobCache(SQLiteStore):
+    """
+    Scraped-jobs cache shared by every worker process through one SQLite file.
+
+    - Entries expire after `ttl` seconds and the least recently used ones are
+      evicted beyond `max_entries`.
+    - Concurrent misses for the same query trigger a single scrape: threads
+      wait on an in-process event, other processes wait on a lease row.
+    - hit/miss/scrape counters are kept per process (see stats()).
+    """
+
+    def __init__(self, path=JOB_CACHE_PATH, ttl=JOB_CACHE_TTL, max_entries=JOB_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> threading.Event
+        self.counters = {"hits": 0, "misses": 0, "scrapes": 0, "waits": 0, "evictions": 0}
+        super().__init__(path)
+
+    def _create_schema(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_cache (
+                query TEXT PRIMARY KEY,
+                pages INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_lease (
+                query TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    @staticmethod
+    def _key(query):
+        return query.strip().lower()
+
+    # -------- Storage --------
+
+    def get(self, query, pages=1, max_age=None):
+        """Cached DataFrame for query if it is fresh and covers `pages`, else None."""
+        max_age = self.ttl if max_age is None else max_age
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT pages, created_at, payload FROM job_cache WHERE query = ?",
+            (self._key(query),),
+        ).fetchone()
+        if row is None or row[0] < pages or time.time() - row[1] > max_age:
+            return None
+        conn.execute("UPDATE job_cache SET last_access = ? WHERE query = ?", (time.time(), self._key(query)))
+        conn.commit()
+        return pickle.loads(row[2])
+
+    def put(self, query, df, pages=1):
+        """
+        Stores a scrape. A fresh entry that covers more pages is kept, so a
+        1-page monitor scrape never replaces a 2-page /index entry within TTL.
+        """
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            """
+            INSERT INTO job_cache (query, pages, created_at, last_access, payload) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (query) DO UPDATE SET
+                pages = excluded.pages,
+                created_at = excluded.created_at,
+                last_access = excluded.last_access,
+                payload = excluded.payload
+            WHERE job_cache.pages <= excluded.pages OR job_cache.created_at < ?
+            """,
+            (self._key(query), pages, now, now, pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL), now - self.ttl),
+        )
+        evicted = conn.execute("DELETE FROM job_cache WHERE created_at < ?", (now - self.ttl,)).rowcount
+        evicted += conn.execute(
+            "DELETE FROM job_cache WHERE query NOT IN "
+            "(SELECT query FROM job_cache ORDER BY last_access DESC LIMIT ?)",
+            (self.max_entries,),
+        ).rowcount
+        conn.commit()
+        if evicted:
+            self._count("evictions", evicted)
+
+    # -------- Cross-process lease --------
+
+    def _try_lease(self, key, owner):
+        now = time.time()
+        conn = self._conn()
+        conn.execute("DELETE FROM scrape_lease WHERE query = ? AND expires_at < ?", (key, now))
+        acquired = conn.execute(
+            "INSERT OR IGNORE INTO scrape_lease (query, owner, expires_at) VALUES (?, ?, ?)",
+            (key, owner, now + SCRAPE_LEASE_SECONDS),
+        ).rowcount == 1
+        conn.commit()
+        return acquired
+
+    def _release_lease(self, key, owner):
+        conn = self._conn()
+        conn.execute("DELETE FROM scrape_lease WHERE query = ? AND owner = ?", (key, owner))
+        conn.commit()
+
+    # -------- Single-flight lookup --------
+
+    def get_or_scrape(self, query, scrape_func, pages=1, max_age=None):
+        """Returns cached jobs for query, scraping at most once across threads and processes."""
+        key = self._key(query)
+        while True:
+            df = self.get(query, pages, max_age)
+            if df is not None:
+                self._count("hits")
+                print(f"✅ Using cached jobs for: {query}")
+                return df
+
+            with self._lock:
+                event = self._inflight.get(key)
+                leader = event is None
+                if leader:
+                    event = self._inflight[key] = threading.Event()
+
+            if not leader:
+                # Another thread in this process is scraping the same query
+                self._count("waits")
+                event.wait(SCRAPE_LEASE_SECONDS)
+                continue
+
+            try:
+                owner = f"{os.getpid()}:{threading.get_ident()}"
+                if not self._try_lease(key, owner):
+                    # Another process is scraping it; wait for its result to land
+                    self._count("waits")
+                    deadline = time.time() + SCRAPE_LEASE_SECONDS
+                    while time.time() < deadline:
+                        time.sleep(0.5)
+                        df = self.get(query, pages, max_age)
+                        if df is not None:
+                            self._count("hits")
+                            return df
+                        if self._try_lease(key, owner):
+                            break
+                    else:
+                        continue
+
+                try:
+                    self._count("misses")
+                    self._count("scrapes")
+                    df = scrape_func(query, pages=pages)
+                    self.put(query, df, pages)
+                    return df
+                finally:
+                    self._release_lease(key, owner)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = counters["hits"] / lookups if lookups else 0.0
+        counters["entries"] = self._conn().execute("SELECT COUNT(*) FROM job_cache").fetchone()[0]
+        return counters
@@ -0,0 +1,170 @@
+# scraper/job_store.py
+
+import hashlib
+import os
+import re
+import time
+
+from sqlite_store import SQLiteStore
+
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "data/jobs.db")
+JOB_FIELDS = ["title", "company", "location", "description", "link"]
+STORE_COLUMNS = ["posting_id", *JOB_FIELDS, "query", "first_seen", "last_seen", "times_seen"]
+POSTING_ID_PATTERN = re.compile(r"jobs-(\d+)")
+SQLITE_MAX_VARS = 500
+
+
+def posting_id(link, title="", company=""):
+    """
+    Rozee posting ID from the link ("...-karachi-jobs-1663422?utm_..." -> "jobs-1663422").
+    Links without one fall back to a hash of the link (or title + company), so
+    they are still de-duplicated.
+    """
+    match = POSTING_ID_PATTERN.search((link or "").split("?", 1)[0])
+    if match:
+        return f"jobs-{match.group(1)}"
+    basis = link or f"{title}|{company}"
+    return "hash-" + hashlib.sha256(basis.encode("utf-8")).hexdigest()[:16]
+
+
+def _text(value):
+    """Cell value as a string; pandas NaN/None become ''."""
+    return value if isinstance(value, str) else ""
+
+
+class JobStore(SQLiteStore):
+    """
+    Persistent corpus of every scraped posting, shared by all worker processes
+    through one SQLite file.
+
+    - Append-only: a posting is keyed by its ID and inserted once; seeing it
+      again only refreshes its fields and last_seen, so first_seen is kept.
+    - Concurrent scrapes each upsert in their own transaction instead of
+      overwriting one CSV.
+    - load() reads only the requested columns, so matching can project
+      title/description without touching the rest.
+    """
+
+    def __init__(self, path=JOB_STORE_PATH):
+        super().__init__(path)
+
+    def _create_schema(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job (
+                posting_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                company TEXT NOT NULL,
+                location TEXT NOT NULL,
+                description TEXT NOT NULL,
+                link TEXT NOT NULL,
+                query TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                times_seen INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_job_last_seen ON job (last_seen)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_job_query ON job (query)")
+
+    def add(self, df, query="", seen_at=None):
+        """
+        Upserts the postings in a scraped DataFrame. Returns the number that
+        were new to the store.
+        """
+        seen_at = time.time() if seen_at is None else seen_at
+        rows = {}
+        for job in df[JOB_FIELDS].itertuples(index=False):
+            fields = [_text(value) for value in job]
+            rows[posting_id(fields[4], fields[0], fields[1])] = fields  # last copy wins within one scrape
+        if not rows:
+            return 0
+
+        conn = self._conn()
+        known = self._existing_ids(list(rows))
+        conn.executemany(
+            """
+            INSERT INTO job (posting_id, title, company, location, description, link, query, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (posting_id) DO UPDATE SET
+                title = excluded.title,
+                company = excluded.company,
+                location = excluded.location,
+                description = excluded.description,
+                link = excluded.link,
+                last_seen = excluded.last_seen,
+                times_seen = job.times_seen + 1
+            WHERE job.last_seen < excluded.last_seen
+            """,
+            [(pid, *fields, query, seen_at, seen_at) for pid, fields in rows.items()],
+        )
+        conn.commit()
+        return len(rows) - len(known)
+
+    def _existing_ids(self, ids):
+        conn = self._conn()
+        found = set()
+        for i in range(0, len(ids), SQLITE_MAX_VARS):
+            chunk = ids[i:i + SQLITE_MAX_VARS]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(row[0] for row in conn.execute(
+                f"SELECT posting_id FROM job WHERE posting_id IN ({placeholders})", chunk
+            ))
+        return found
+
+    def load(self, columns=JOB_FIELDS, query=None, since=None, limit=None):
+        """
+        Postings as a DataFrame with only `columns`, most recently seen first.
+        Optionally restricted to one scrape query or to postings seen since a
+        timestamp.
+        """
+        import pandas as pd
+
+        unknown = set(columns) - set(STORE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown job store columns: {sorted(unknown)}")
+
+        sql = f"SELECT {', '.join(columns)} FROM job"
+        where, params = [], []
+        if query is not None:
+            where.append("query = ?")
+            params.append(query)
+        if since is not None:
+            where.append("last_seen >= ?")
+            params.append(since)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY last_seen DESC, posting_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        rows = self._conn().execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=list(columns))
+
+    def import_csv(self, path, query=""):
+        """One-off import of an old scrape CSV; the file's mtime is used as its seen time."""
+        import pandas as pd
+
+        df = pd.read_csv(path, usecols=lambda column: column in JOB_FIELDS)
+        for column in JOB_FIELDS:
+            if column not in df:
+                df[column] = ""
+        return self.add(df, query=query, seen_at=os.path.getmtime(path))
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM job").fetchone()[0]
+
+    def stats(self):
+        row = self._conn().execute("SELECT COUNT(*), MIN(first_seen), MAX(last_seen) FROM job").fetchone()
+        return {"postings": row[0], "oldest_first_seen": row[1] or 0, "latest_seen": row[2] or 0}
+
+
+# One store per process, shared by the scraper (writes) and the matcher (reads)
+job_store = JobStore()
+
+
+if __name__ == "__main__":
+    import sys
+
+    for csv_path in sys.argv[1:] or ["data/rozee_jobs.csv"]:
+        print(f"✅ Imported {job_store.import_csv(csv_path)} new postings from {csv_path}")
+    print(f"📦 Job store now holds {job_store.count()} postings")
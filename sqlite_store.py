@@ -0,0 +1,68 @@
+# sqlite_store.py
+
+import os
+import sqlite3
+import threading
+import weakref
+
+SQLITE_BUSY_TIMEOUT = 30  # seconds a writer waits for another process's lock
+
+
+class SQLiteStore:
+    """
+    Base for the SQLite-backed stores shared by all worker processes
+    (keyword store, job cache, job store, result store, rewrite store).
+
+    - One connection per thread, opened on first use with WAL journaling and
+      synchronous=NORMAL, so readers never block the single writer.
+    - Subclasses create their tables in _create_schema(conn). That connection
+      is closed right after, so a gunicorn master that preloads the app holds
+      no SQLite handle when it forks; reset_all_after_fork() drops whatever a
+      forked worker inherited anyway.
+    """
+
+    row_factory = None
+    _instances = weakref.WeakSet()
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        self._create_schema(conn)
+        conn.commit()
+        self.close()
+        SQLiteStore._instances.add(self)
+
+    def _create_schema(self, conn):
+        raise NotImplementedError
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT)
+            if self.row_factory is not None:
+                conn.row_factory = self.row_factory
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Closes this thread's connection; the next call opens a new one."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def reset_after_fork(self):
+        """Drops, without closing, connections inherited from the parent process."""
+        self._local = threading.local()
+
+    @classmethod
+    def reset_all_after_fork(cls):
+        """reset_after_fork() on every store created in this process."""
+        for store in list(cls._instances):
+            store.reset_after_fork()
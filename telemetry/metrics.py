@@ -0,0 +1,229 @@
+# telemetry/metrics.py
+
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+TIMING_LOG = os.getenv("TIMING_LOG")  # file for per-request timing lines; stdout if unset
+
+
+# -------- Metric types --------
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def _label_text(self, key, extra=None):
+        pairs = list(zip(self.labels, key)) + (extra or [])
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name + self._label_text(key), value) for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def samples(self):
+        with self._lock:
+            return [(self.name + self._label_text(key), value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        out = []
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    out.append((self.name + "_bucket" + self._label_text(key, [("le", repr(float(bound)))]),
+                                cumulative))
+                cumulative += counts[-1]
+                out.append((self.name + "_bucket" + self._label_text(key, [("le", "+Inf")]), cumulative))
+                out.append((self.name + "_sum" + self._label_text(key), total))
+                out.append((self.name + "_count" + self._label_text(key), cumulative))
+        return out
+
+
+# -------- Registry --------
+
+class Registry:
+    """
+    Process-wide metrics. Metrics are created once by name and reused;
+    collectors are callables returning {name: number} that are read at scrape time, so existing stats dicts (JobCache.stats(),
+    scheduler.stats, ...) can be exported as gauges without being rewritten.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labels, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels, **kwargs)
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def register_collector(self, prefix, collect):
+        """collect() -> {name: number}; exported as gauges named prefix_name."""
+        with self._lock:
+            self._collectors[prefix] = collect
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name} {_number(value)}" for name, value in metric.samples())
+
+        for prefix, collect in collectors:
+            try:
+                values = collect()
+            except Exception as e:
+                print(f"⚠️ Metrics collector '{prefix}' failed: {e}")
+                continue
+            for name, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                full_name = f"{prefix}_{name}"
+                lines.append(f"# TYPE {full_name} gauge")
+                lines.append(f"{full_name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+stage_seconds = registry.histogram(
+    "stage_duration_seconds", "Time spent in each pipeline stage", labels=("stage",)
+)
+stage_errors = registry.counter(
+    "stage_errors_total", "Pipeline stages that raised", labels=("stage",)
+)
+
+
+# -------- Per-request traces --------
+
+_trace = threading.local()
+timing_logger = logging.getLogger("timing")
+if not timing_logger.handlers:
+    timing_logger.addHandler(logging.FileHandler(TIMING_LOG) if TIMING_LOG else logging.StreamHandler())
+    timing_logger.setLevel(logging.INFO)
+    timing_logger.propagate = False
+
+
+def start_trace(**fields):
+    """Starts collecting stage timings on this thread (one request or one background task)."""
+    _trace.current = {"fields": fields, "stages": {}, "started": time.perf_counter()}
+
+
+def finish_trace(**fields):
+    """Ends the thread's trace and writes it as one JSON line to the timing log."""
+    trace = getattr(_trace, "current", None)
+    if trace is None:
+        return None
+    _trace.current = None
+    record = {
+        **trace["fields"],
+        **fields,
+        "seconds": round(time.perf_counter() - trace["started"], 4),
+        "stages": {stage: round(seconds, 4) for stage, seconds in trace["stages"].items()},
+    }
+    timing_logger.info(json.dumps(record, default=str))
+    return record
+
+
+@contextmanager
+def timed(stage):
+    """Times a block into stage_duration_seconds and the current thread's trace."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        stage_errors.inc(stage=stage)
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        stage_seconds.observe(seconds, stage=stage)
+        trace = getattr(_trace, "current", None)
+        if trace is not None:
+            trace["stages"][stage] = trace["stages"].get(stage, 0.0) + seconds
+
+
+def timed_function(stage):
+    """Decorator form of timed()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,107 @@
+# telemetry/profiler.py
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+PROFILE_MAX_BYTES = int(os.getenv("PROFILE_MAX_BYTES", str(200 * 1024 * 1024)))  # 200 MB
+PROFILE_SUMMARY_LINES = 60
+
+# cProfile cannot run two profilers at once on Python 3.12+, so captures are serialized
+_capture_lock = threading.Lock()
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", str(text)).strip("-")[:60] or "unit"
+
+
+@contextmanager
+def profiled(kind, label, directory=PROFILE_DIR):
+    """
+    Runs the block under cProfile and saves <kind>-<label>-<time>.prof (pstats
+    format, for pstats or snakeviz) plus a .txt summary of the top functions
+    by cumulative time.
+    The directory keeps at most PROFILE_MAX_FILES captures / PROFILE_MAX_BYTES;
+    the oldest are deleted first. If another capture is running, the block
+    runs unprofiled.
+    """
+    if not _capture_lock.acquire(blocking=False):
+        print(f"⚠️ Profiler busy, not profiling {kind} '{label}'")
+        yield None
+        return
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+        try:
+            yield profile
+        finally:
+            profile.disable()
+    finally:
+        _capture_lock.release()
+        try:
+            path = save_profile(profile, kind, label, directory)
+            print(f"🧪 Profile saved: {path}")
+        except Exception as e:
+            print(f"⚠️ Could not save profile for {kind} '{label}': {e}")
+
+
+def maybe_profiled(enabled, kind, label):
+    """profiled() when `enabled`, otherwise a no-op context."""
+    return profiled(kind, label) if enabled else nullcontext()
+
+
+def save_profile(profile, kind, label, directory=PROFILE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{_slug(kind)}-{_slug(label)}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    profile.dump_stats(base + ".prof")
+
+    summary = io.StringIO()
+    pstats.Stats(profile, stream=summary).sort_stats("cumulative").print_stats(PROFILE_SUMMARY_LINES)
+    with open(base + ".txt", "w") as f:
+        f.write(summary.getvalue())
+
+    rotate_profiles(directory)
+    return base + ".prof"
+
+
+def rotate_profiles(directory=PROFILE_DIR, max_files=PROFILE_MAX_FILES, max_bytes=PROFILE_MAX_BYTES):
+    """Deletes the oldest captures (.prof and its .txt) beyond max_files or max_bytes."""
+    captures = list_profiles(directory)  # newest first
+    kept, total = 0, 0
+    for capture in captures:
+        total += capture["size"]
+        kept += 1
+        if kept > max_files or total > max_bytes:
+            for extension in (".prof", ".txt"):
+                try:
+                    os.remove(os.path.join(directory, capture["name"][:-5] + extension))
+                except FileNotFoundError:
+                    pass
+
+
+def list_profiles(directory=PROFILE_DIR):
+    """Captured profiles, newest first, as dicts with name, kind, size and capture time."""
+    if not os.path.isdir(directory):
+        return []
+    captures = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(".prof"):
+            continue
+        stat = entry.stat()
+        captures.append({
+            "name": entry.name,
+            "kind": entry.name.split("-", 1)[0],
+            "size": stat.st_size,
+            "created_at": stat.st_mtime,
+            "captured": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stat.st_mtime)),
+            "has_summary": os.path.exists(entry.path[:-5] + ".txt"),
+        })
+    return sorted(captures, key=lambda c: c["created_at"], reverse=True)
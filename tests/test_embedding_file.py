@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+
+from matcher import embedding_file
+from matcher.embedding_file import EmbeddingFile
+
+
+def random_vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+
+
+def test_score_is_stable_across_refresh_and_compaction(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_file, "MAX_SEGMENTS", 1000)  # compact only when asked
+    directory = str(tmp_path / "embeddings")
+    writer = EmbeddingFile(directory)
+    reader = EmbeddingFile(directory)  # another worker's view of the same files
+
+    vectors = random_vectors(60)
+    keys = [f"{i:064x}" for i in range(60)]
+    for start in range(0, 60, 10):
+        writer.append(keys[start:start + 10], vectors[start:start + 10])
+    query = random_vectors(1, seed=1)
+
+    before = reader.score(query, keys)  # picks up the new segments through refresh
+    writer.compact()
+    after_compaction = reader.score(query, keys)  # still on its old mappings
+    reader.refresh()
+    after_refresh = reader.score(query, keys)
+
+    assert np.all(before != 0)
+    assert np.allclose(before, after_compaction)
+    assert np.allclose(before, after_refresh)
+    assert len(reader) == 60
+
+
+def test_concurrent_scoring_during_compaction(tmp_path):
+    store = EmbeddingFile(str(tmp_path / "embeddings"))
+    keys = [f"{i:064x}" for i in range(200)]
+    store.append(keys[:100], random_vectors(100))
+    expected = store.score(random_vectors(1, seed=1), keys[:100])
+    errors = []
+
+    def read():
+        try:
+            for _ in range(50):
+                assert np.allclose(store.score(random_vectors(1, seed=1), keys[:100]), expected)
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for thread in readers:
+        thread.start()
+    for start in range(100, 200, 10):
+        store.append(keys[start:start + 10], random_vectors(10, seed=start))
+        store.compact()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+
+
+def test_vectors_match_the_stored_embeddings(tmp_path):
+    store = EmbeddingFile(str(tmp_path / "embeddings"), dtype="float16")
+    vectors = random_vectors(5)
+    keys = [f"{i:064x}" for i in range(5)]
+    store.append(keys, vectors)
+
+    read = store.vectors(keys + ["unknown"])
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    assert np.allclose(read[:5], normalized, atol=1e-3)
+    assert not read[5].any()
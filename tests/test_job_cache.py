@@ -0,0 +1,43 @@
+import pandas as pd
+
+from scraper.job_cache import JobCache
+
+
+def jobs(*titles):
+    return pd.DataFrame({"title": list(titles)})
+
+
+def test_fewer_pages_never_replace_a_fresh_entry(tmp_path):
+    cache = JobCache(str(tmp_path / "job_cache.db"), ttl=1800)
+    cache.put("python", jobs("a", "b"), pages=2)
+
+    cache.put("python", jobs("a"), pages=1)  # e.g. the monitor's 1-page scrape
+
+    assert cache.get("python", pages=2)["title"].tolist() == ["a", "b"]
+
+
+def test_more_pages_or_an_expired_entry_are_replaced(tmp_path):
+    cache = JobCache(str(tmp_path / "job_cache.db"), ttl=1800)
+    cache.put("python", jobs("a"), pages=1)
+    cache.put("python", jobs("a", "b"), pages=2)
+    assert cache.get("python", pages=2)["title"].tolist() == ["a", "b"]
+
+    conn = cache._conn()
+    conn.execute("UPDATE job_cache SET created_at = created_at - 3600")  # past its TTL
+    conn.commit()
+    cache.put("python", jobs("c"), pages=1)
+    assert cache.get("python", pages=1)["title"].tolist() == ["c"]
+
+
+def test_get_or_scrape_scrapes_once(tmp_path):
+    cache = JobCache(str(tmp_path / "job_cache.db"))
+    calls = []
+
+    def scrape(query, pages=1):
+        calls.append((query, pages))
+        return jobs("a")
+
+    cache.get_or_scrape("Python ", scrape, pages=1)
+    cache.get_or_scrape("python", scrape, pages=1)
+
+    assert calls == [("Python ", 1)]
@@ -0,0 +1,50 @@
+from llm import llm_client
+from llm.llm_client import FakeBackend, LLMClient, TokenBucket
+from llm.rewrite_store import RewriteStore
+
+
+def make_client(backend):
+    return LLMClient(backend=backend, bucket=TokenBucket(rate=1000, capacity=100))
+
+
+def test_repeated_prompt_is_served_from_the_cache():
+    backend = FakeBackend(responses={"rate my resume": "Score: 80/100"})
+    client = make_client(backend)
+
+    assert client.generate("rate my resume") == "Score: 80/100"
+    assert client.generate("rate my resume") == "Score: 80/100"
+    assert "".join(client.stream("rate my resume")) == "Score: 80/100"
+    assert backend.calls == 1
+    assert client.stats["hits"] == 2
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(llm_client.time, "sleep", lambda seconds: None)
+    backend = FakeBackend(fail_times=2)
+    client = make_client(backend)
+
+    assert client.generate("rewrite my resume").startswith("[")
+    assert backend.calls == 3
+    assert client.stats["retries"] == 2
+
+
+def test_generate_many_and_stream_use_the_fake_model():
+    client = make_client(FakeBackend())
+
+    feedback, rewrite = client.generate_many(["feedback prompt", "rewrite prompt"])
+    streamed = "".join(client.stream("another prompt"))
+
+    assert "feedback prompt" in feedback and "rewrite prompt" in rewrite
+    assert "another prompt" in streamed
+    assert client.generate("another prompt") == streamed  # the streamed reply was cached
+
+
+def test_rewrite_store_serves_a_rewrite_until_it_expires(tmp_path):
+    store = RewriteStore(str(tmp_path / "rewrites.db"), ttl=60)
+    store.put(1, "hash-a", "improved resume")
+
+    assert store.get(1, "hash-a") == "improved resume"
+    assert store.get(2, "hash-a") is None
+
+    expired = RewriteStore(str(tmp_path / "rewrites.db"), ttl=-1)
+    assert expired.get(1, "hash-a") is None
@@ -0,0 +1,62 @@
+import os
+
+from scraper.engine import page_is_ready, parse_job_card, parse_jobs_html, rendered_lines
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_parse_jobs_html_reads_filled_cards():
+    jobs = parse_jobs_html(read_fixture("rozee_search_results.html"))
+
+    assert jobs == [
+        {
+            "title": "Python Developer",
+            "company": "Acme Ltd",
+            "location": "Karachi, Pakistan",
+            "description": "We are looking for a Python developer with Django and REST API experience "
+                           "to build internal tools..",
+            "link": "https://www.rozee.pk/acme-ltd-python-developer-karachi-jobs-1664496?utm_source=jobSearch",
+        },
+        {
+            "title": "Data Scientist",
+            "company": "Numbers Inc",
+            "location": "N/A",
+            "description": "Build forecasting models in Python",
+            "link": "https://www.rozee.pk/data-scientist-lahore-jobs-1663422",
+        },
+    ]
+
+
+def test_links_are_resolved_against_the_page_url():
+    html = '<div class="job"><h3><a href="/j-1">Analyst</a></h3><div>Acme</div><div>Desc</div></div>'
+
+    assert parse_jobs_html(html, "http://localhost:8000/results/pn/2")[0]["link"] == "http://localhost:8000/j-1"
+
+
+def test_inline_company_and_city_anchors_stay_on_one_line():
+    from bs4 import BeautifulSoup
+
+    card = BeautifulSoup(
+        '<div class="job"><h3><a href="/j">Analyst</a></h3>'
+        '<div class="cname"><a>Acme Ltd</a>, <a>Karachi</a></div><div>Desc</div></div>',
+        "html.parser",
+    ).div
+
+    assert rendered_lines(card) == ["Analyst", "Acme Ltd, Karachi", "Desc"]
+    assert parse_job_card(rendered_lines(card), "/j") == {
+        "title": "Analyst", "company": "Acme Ltd", "location": "Karachi", "description": "Desc", "link": "/j",
+    }
+
+
+def test_skeleton_page_is_not_ready():
+    skeleton = read_fixture("rozee_search_results.html").split("<div id=\"jobs\">")[0] + \
+        '<div class="job"><div class="jhead"><div class="panel-effect"></div></div></div>'
+
+    assert parse_jobs_html(skeleton) == []
+    assert not page_is_ready(skeleton)
+    assert page_is_ready(read_fixture("rozee_search_results.html"))
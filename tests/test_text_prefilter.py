@@ -0,0 +1,26 @@
+from matcher.text_prefilter import InvertedIndex
+
+
+def test_batch_larger_than_max_docs_is_kept_whole():
+    index = InvertedIndex(max_docs=1000)
+    keys = [f"k{i}" for i in range(1500)]
+    texts = [f"python developer posting{i}" for i in range(1500)]
+
+    index.add_many(keys, texts)
+
+    assert len(index) == 1500
+    assert "k10" in index
+    assert "k10" in index.shortlist(["posting10 python"], keys, k=1)
+
+
+def test_re_seen_postings_survive_eviction():
+    index = InvertedIndex(max_docs=10)
+    index.add_many([f"old{i}" for i in range(10)], [f"django job{i}" for i in range(10)])
+    index.add_many(["old0"], ["django job0"])
+
+    index.add_many([f"new{i}" for i in range(5)], [f"flask job{i}" for i in range(5)])
+
+    assert len(index) == 10
+    assert "old0" in index
+    assert not any(f"old{i}" in index for i in range(1, 6))
+    assert index.scores(["django"], ["old1", "old0"]).tolist()[0] == 0
@@ -0,0 +1,27 @@
+import numpy as np
+
+from matcher.tfidf_corpus import TfidfCorpus
+
+
+def test_batch_larger_than_max_docs_is_kept_whole():
+    corpus = TfidfCorpus(max_docs=10)
+    keys = [f"k{i}" for i in range(25)]
+
+    corpus.add_many(keys, [f"python developer job number{i}" for i in range(25)])
+
+    assert len(corpus) == 25
+    assert all(key in corpus for key in keys)
+    assert np.all(corpus.similarity("python developer", keys) > 0)
+
+
+def test_older_postings_are_evicted_first():
+    corpus = TfidfCorpus(max_docs=10)
+    corpus.add_many([f"old{i}" for i in range(10)], [f"django job{i}" for i in range(10)])
+    corpus.add_many(["old0"], ["django job0"])  # seen again: most recently used
+
+    corpus.add_many([f"new{i}" for i in range(5)], [f"flask job{i}" for i in range(5)])
+
+    assert len(corpus) == 10
+    assert "old0" in corpus
+    assert all(f"new{i}" in corpus for i in range(5))
+    assert not any(f"old{i}" in corpus for i in range(1, 6))
@@ -0,0 +1,65 @@
+import numpy as np
+
+from matcher.embedding_file import EmbeddingFile
+from matcher.vector_index import ExactIndex, IVFIndex
+
+
+def make_store(tmp_path, n, dim=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32)
+    keys = [f"{i:064x}" for i in range(n)]
+    store = EmbeddingFile(str(tmp_path / "embeddings"))
+    store.append(keys, vectors)
+    return store, keys, vectors
+
+
+def test_ivf_search_returns_k_allowed_keys(tmp_path):
+    store, keys, vectors = make_store(tmp_path, 20000)
+    index = IVFIndex(store, n_lists=64, n_probe=2, max_size=len(keys))
+    index.add(keys)
+    allowed = set(keys[::3])  # more than EXACT_SEARCH_MAX, so the buckets are probed
+
+    found, scores = index.search(vectors[1], k=1000, allowed=allowed)
+
+    assert len(found) == 1000
+    assert set(found) <= allowed
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_exact_search_finds_the_query_vector(tmp_path):
+    store, keys, vectors = make_store(tmp_path, 500)
+    index = ExactIndex(store)
+    index.add(keys)
+
+    found, scores = index.search(vectors[42], k=3)
+
+    assert found[0] == keys[42]
+    assert scores[0] > 0.99
+
+
+def test_index_is_bounded_but_keeps_the_current_batch(tmp_path):
+    store, keys, _ = make_store(tmp_path, 3000)
+    index = IVFIndex(store, n_lists=10, train_size=400, max_size=1000)
+
+    index.add(keys[:1500])
+    assert len(index) == 1500  # one batch larger than max_size is kept whole
+
+    index.add(keys[1500:1800])
+    assert len(index) == 1000
+    assert keys[0] not in index and keys[1799] in index
+    assert sum(len(bucket) for bucket in index._lists) == len(index)
+
+
+def test_ivf_retrains_as_keys_are_inserted(tmp_path):
+    store, keys, _ = make_store(tmp_path, 2000)
+    index = IVFIndex(store, n_lists=10, train_size=400)
+
+    index.add(keys[:300])
+    assert index._centroids is None  # searched exhaustively until trained
+    index.add(keys[300:500])
+    first = index._centroids
+    assert first is not None
+
+    index.add(keys[500:700])
+    assert index._centroids is first
+    index.add(keys[700:900])
+    assert index._centroids is not first